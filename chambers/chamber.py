@@ -2,20 +2,185 @@
 Chamber base class.
 """
 
-import chambers.const
+import abc
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from chambers.const import ADJOURN, ALL_EVENTS, CONVENE, CONVENE_SCHEDULED
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import functools
 #import json
 import logging
 from operator import itemgetter
 import os
 import pathlib
 import pickle
+import requests
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zoneinfo
 from zoneinfo import ZoneInfo
 
-
-class Chamber:
-    _dctz = zoneinfo.ZoneInfo('America/New_York')
+# DC time. ZoneInfo objects are immutable, so one instance is shared by everything.
+_DCTZ = ZoneInfo('America/New_York')
+_UTC = timezone.utc
+# Initial value for the time trackers, so they trip reset on startup.
+_EPOCH_SENTINEL = datetime(1900, 1, 1, 0, 0, 0, tzinfo=_DCTZ)
+# Sort and search key for events.
+_TIMESTAMP = itemgetter('timestamp')
+# Default event types to search.
+_ALL_EVENT_TYPES = ALL_EVENTS
+
+
+def _new_index_entry():
+    """ Empty search index entry. A list of timestamps and a parallel list of events. """
+    return [], []
+
+
+def _normalize_types(types):
+    """ Normalize the types to search into something iterable. None means all types. """
+    if type(types) is frozenset:
+        # Already normalized.
+        return types
+    elif types is None:
+        return _ALL_EVENT_TYPES
+    elif isinstance(types, (str, int)):
+        # If a single type, make it a tuple of one.
+        return (types,)
+    else:
+        # A set, so a type listed twice is only searched once.
+        return frozenset(types)
+
+
+def _mk_search(event_type, search_forward):
+    """
+    Make a search method for the closest event of one fixed type. The base class searches for the same few types on
+    every update, so these skip type normalization and the loop over types, and go straight to a single bisect.
+
+    :param event_type: Type of event to search for.
+    :type event_type: int
+    :param search_forward: Search for the next event if set, otherwise the latest.
+    :type search_forward: bool
+    :return: function
+    """
+    if search_forward:
+        def search(self, target_dt=None):
+            if target_dt is None:
+                target_dt = datetime.now(_UTC)
+            entry = self._events_by_type.get(event_type)
+            if entry is None:
+                return None
+            timestamps, typed_events = entry
+            i = bisect_left(timestamps, target_dt)
+            return typed_events[i] if i < len(timestamps) else None
+    else:
+        def search(self, target_dt=None):
+            if target_dt is None:
+                target_dt = datetime.now(_UTC)
+            entry = self._events_by_type.get(event_type)
+            if entry is None:
+                return None
+            timestamps, typed_events = entry
+            i = bisect_right(timestamps, target_dt)
+            return typed_events[i - 1] if i > 0 else None
+    search.__doc__ = """
+        Find the {} event of type {} relative to a reference time, which defaults to now.
+
+        :return: dict or None
+        """.format('next' if search_forward else 'latest', event_type)
+    return search
+
+
+# Cache file layout. Timestamps and types are stored as packed columns, everything else per-event.
+_CACHE_FORMAT = 2
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+# Formatter for the console handler used when no parent logger is given.
+_DEFAULT_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+# Update intervals.
+_SIXTY_SEC = timedelta(seconds=60)
+_TWO_MIN = timedelta(minutes=2)
+_TEN_MIN = timedelta(minutes=10)
+_THIRTY_MIN = timedelta(minutes=30)
+_ONE_DAY = timedelta(days=1)
+
+
+def _new_session():
+    """
+    Make a requests session for fetching chamber data. Connections are kept alive and reused across requests and
+    updates. Connection failures and server errors are retried with a short backoff. 404s are not, since a missing
+    day is an expected answer.
+
+    :return: requests.Session
+    """
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=10, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class _KeptResponse:
+    """
+    Stand-in for a response, for a document read back from the journal directory or replayed from memory. Has just the
+    parts of requests.Response the loaders look at.
+    """
+    status_code = 200
+    ok = True
+    history = ()
+
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+        self.headers = {}
+
+    def raise_for_status(self):
+        """ Stand-ins are only made for good responses, so there's never anything to raise. """
+        pass
+
+
+def _token_cached(func):
+    """
+    Cache a Chamber method's results until the chamber's cache token changes. The token is bumped on every update and
+    whenever the event log changes, so each result is computed at most once per update cycle.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._token_cache[0] != self._cache_token:
+            self._token_cache = (self._cache_token, {})
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        results = self._token_cache[1]
+        try:
+            return results[key]
+        except KeyError:
+            value = results[key] = func(self, *args, **kwargs)
+            return value
+    return wrapper
+
+
+class Chamber(abc.ABC):
+    _dctz = _DCTZ
+    # HTTP connect and read timeouts, in seconds.
+    _http_timeout = (3.05, 10)
+    # Most days to fetch at once when walking back through past days.
+    _probe_window = 8
+    # Furthest back to walk, in days. Even long recesses have pro forma sessions every few days, so anything older than
+    # this isn't going to be the latest session.
+    _max_days_back = 14
+    # When adjourned with no convening scheduled, polls start this far apart and stretch by the backoff factor after
+    # every load that brings nothing new, up to the maximum. Anything new sets them back to the minimum.
+    _idle_interval_min = _TEN_MIN
+    _idle_interval_max = _THIRTY_MIN
+    _idle_backoff = 1.3
+    # Does parsing depend on the clock, as well as on the document? If so, an unchanged document can still mean
+    # something new, so the body of each conditional response is kept and a 304 hands it back to be parsed again.
+    _replay_unchanged = False
+    # HTTP session, shared by every chamber for the life of the process, so there's one connection pool per host and
+    # connections are reused across updates and across objects.
+    _session = _new_session()
 
     def __init__(self, name, load_cache = True, tz = 'America/New_York', parent_logger = None, log_level = logging.WARNING):
         """
@@ -36,10 +201,12 @@ class Chamber:
         if parent_logger is None:
             # If no parent detector is given this sensor is being used in a testing capacity. Create a null logger.
             self._logger = logging.getLogger(name)
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-            console_handler.setLevel(log_level)
-            self._logger.addHandler(console_handler)
+            # Loggers are shared by name, so only attach a handler the first time.
+            if not self._logger.handlers:
+                console_handler = logging.StreamHandler()
+                console_handler.setFormatter(_DEFAULT_FORMATTER)
+                console_handler.setLevel(log_level)
+                self._logger.addHandler(console_handler)
             self._logger.setLevel(log_level)
         else:
             self._logger = parent_logger.getChild(name)
@@ -48,28 +215,43 @@ class Chamber:
         self._name = name
         self._tz = zoneinfo.ZoneInfo(tz)
         # Initialize variables.
-        self._events = [] # Event log.
+        self._events = [] # Event log, oldest first. Only change through _add_event and _remove_event.
+        # Search index. For each event type, a list of timestamps and a matching list of events, sorted by timestamp.
+        self._events_by_type = defaultdict(_new_index_entry)
+        # Events that have an ID, by ID.
+        self._events_by_id = {}
+        self._cache_token = 0 # Bumped whenever cached results may be stale.
+        self._log_revision = 0 # Bumped whenever an event is added or removed.
+        self._token_cache = (0, {})
         self._convened = None
         self._convened_at = None
         self._convenes_at = None
         self._will_convene_at = None
         self._adjourned_at = None
+        # Validators from the last full response for each URL, for conditional requests. Each is (ETag, Last-Modified,
+        # body or None, epoch time stored), with the body only kept for chambers that replay unchanged documents.
+        self._validators = {}
+        # URLs for final days that were found not to exist, with the epoch time they were found. These aren't going to
+        # appear, so aren't fetched again. Kept in the cache, so a restart doesn't probe them all over again.
+        self._missing = {}
 
         # Set the cache file.
         self.cache_path = name.lower() + '.cache'
-        self._logger.info(f"Cache path is: {self.cache_path}")
+        self._logger.info("Cache path is: %s", self.cache_path)
 
         # Initialize time trackers as 1/1/1900 so they trip reset on startup.
-        self._next_update = datetime(1900, 1, 1, 0, 0, 0, tzinfo=Chamber._dctz)
-        self._updated = datetime(1900, 1, 1, 0, 0, 0, tzinfo=Chamber._dctz)
+        self._next_update = _EPOCH_SENTINEL
+        self._next_update_ts = _EPOCH_SENTINEL.timestamp()
+        self._updated = _EPOCH_SENTINEL
+        # Current poll interval while idle, and the event log revision and load time it was last worked out for.
+        self._idle_interval = self._idle_interval_min
+        self._idle_mark = (self._log_revision, self._updated)
 
         if load_cache:
-            if self.cache_path.exists():
-                self._logger.info("Loading cache.")
-                self.load_cache()
+            # load_cache handles a missing file itself, so there's no need to stat it first.
+            self._logger.info("Loading cache.")
+            if self.load_cache():
                 self.update()
-            else:
-                self._logger.info("Cache does not exist.")
         else:
             self._logger.info("Ignoring cache.")
 
@@ -80,8 +262,9 @@ class Chamber:
 
         :return:
         """
-        raise NotImplemented("Must be implemented by a specific base class.")
+        raise NotImplementedError("Must be implemented by a specific base class.")
 
+    @_token_cached
     def adjourned_at(self, tz=None):
         """
         When the chamber adjourned. Returns datetime if adjourned, None if in session.
@@ -99,8 +282,7 @@ class Chamber:
             # Convert the Timezone string to a zoneinfo object.
             tz = zoneinfo.ZoneInfo(tz)
 
-        latest_convene = self._search_events(types=chambers.const.CONVENE)
-        latest_adjourn = self._search_events(types=chambers.const.ADJOURN)
+        latest_convene, latest_adjourn = self._latest_convene_and_adjourn()
         if latest_adjourn is None:
             return None
         elif latest_adjourn['timestamp'] is not None and latest_convene is None:
@@ -130,30 +312,33 @@ class Chamber:
             self._cache_path = cache_path
         else:
             self._logger.info("Cache path is not absolute. Putting cache file in current working directory.")
-            self._cache_path = pathlib.Path().cwd() / cache_path
+            self._cache_path = pathlib.Path.cwd() / cache_path
+        # Scratch file new caches are written to before being swapped in.
+        self._new_cache_path = self._cache_path.parent / f"{self._cache_path.name}.new"
+        # Copies of journals that won't change any more are kept in a directory beside the cache file.
+        self._journal_path = self._cache_path.parent / f"{self._cache_path.stem}_journals"
 
 
     @property
+    @_token_cached
     def convened(self):
         """
         Is the House convened?
         :return:
         """
 
-        latest_convene = self._search_events(types=chambers.const.CONVENE)
-        latest_adjourn = self._search_events(types=chambers.const.ADJOURN)
-        if latest_adjourn is None and latest_convene is None:
+        if not self._events:
             return "Unknown"
-        elif latest_adjourn is not None and latest_convene is None:
-            # If we have an adjourn record but not a convene record.
-            return False
-        elif latest_adjourn is None and latest_convene['timestamp'] is not None:
-            return True
-        elif latest_adjourn['timestamp'] < latest_convene['timestamp']:
+        latest_convene, latest_adjourn = self._latest_convene_and_adjourn()
+        if latest_convene is None:
+            # With an adjourn record but not a convene record, we're adjourned. With neither, we don't know.
+            return "Unknown" if latest_adjourn is None else False
+        elif latest_adjourn is None:
             return True
         else:
-            return False
+            return latest_adjourn['timestamp'] < latest_convene['timestamp']
 
+    @_token_cached
     def convened_at(self, tz=None):
         """
         When the chamber convened for its main session. Does *not* consider Recesses. Will return Datetime if convened,
@@ -172,15 +357,15 @@ class Chamber:
             # Convert the Timezone string to a zoneinfo object.
             tz = zoneinfo.ZoneInfo(tz)
 
-        if self.convened:
-            latest_convene = self._search_events(types=chambers.const.CONVENE)
-            if latest_convene is None:
-                return None
-            else:
-                return latest_convene['timestamp'].astimezone(tz)
+        latest_convene, latest_adjourn = self._latest_convene_and_adjourn()
+        if latest_convene is None:
+            return None
+        elif latest_adjourn is None or latest_adjourn['timestamp'] < latest_convene['timestamp']:
+            return latest_convene['timestamp'].astimezone(tz)
         else:
             return None
 
+    @_token_cached
     def convenes_at(self, tz=None):
         """
         When the chamber will convene next. Returns a datetime if adjourned and a reconvening is set, None otherwise.
@@ -195,7 +380,7 @@ class Chamber:
             # Convert the Timezone string to a zoneinfo object.
             tz = zoneinfo.ZoneInfo(tz)
 
-        next_convene = self._search_events(search_forward=True, types=chambers.const.CONVENE_SCHEDULED)
+        next_convene = self._next_convene_scheduled()
         if next_convene is not None:
             return next_convene['timestamp'].astimezone(tz)
         else:
@@ -207,7 +392,7 @@ class Chamber:
         Latest convening or adjournment action.
         :return: dict
         """
-        raise NotImplemented("Must be implemented by a specific base class.")
+        raise NotImplementedError("Must be implemented by a specific base class.")
 
     @property
     def next(self):
@@ -215,7 +400,7 @@ class Chamber:
         Next scheduled event, if available. If no next event is available, will return an empty list.
         :return: dict
         """
-        raise NotImplemented("Must be implemented by a specific base class.")
+        raise NotImplementedError("Must be implemented by a specific base class.")
 
     @property
     def next_update(self):
@@ -225,38 +410,72 @@ class Chamber:
         """
         return self._next_update
 
-    def _set_next_update(self):
+    def _update_due(self):
+        """
+        Has the next update time passed? Checked against the next update as a POSIX timestamp, so the regular ticks where
+        nothing is due don't need to build a timezone aware datetime.
+
+        :return: bool
+        """
+        return time.time() > self._next_update_ts
+
+    def _set_next_update(self, now=None):
         """
         Calculate the next update from the current status of the chamber and known events.
 
-       :return: None
+        :param now: Current time, if the caller already has it. Defaults to now.
+        :type now: datetime
+        :return: datetime
         """
-        if self.convened:
-            self._next_update = (self._updated + timedelta(minutes=2)).replace(second=0, microsecond=0)
-            self._logger.debug("Chamber is convened. Next update at {}".format(self.next_update))
-            return None
-        else:
-            # If we know when the chamber next convenes, the next check should be ten minutes before that.
-            if self.convenes_at() is not None:
-                preconvene_target = self.convenes_at() - timedelta(minutes=10)
-                if preconvene_target < datetime.now(timezone.utc):
-                    self._logger.debug("Updated is {}".format(self._updated))
-                    self._next_update = self._updated + timedelta(seconds=60)
-                    self._logger.info(
-                        "Chamber is adjourned and has scheduled convening that was missed. Next update - {}".format(self.next_update))
-                    return None
-                else:
-                    self._next_update = preconvene_target
-                    self._logger.debug(
-                        "Chamber is not convened and has scheduled convening. Next update - {}".format(self.next_update))
-
-                    return None
+        if now is None:
+            now = datetime.now(_UTC)
+        mark = (self._log_revision, self._updated)
+        if mark != self._idle_mark:
+            # There's been a load since the idle interval was last worked out. Back off if it found nothing new.
+            if mark[0] != self._idle_mark[0]:
+                self._idle_interval = self._idle_interval_min
             else:
-                self._next_update = self._updated + timedelta(minutes=10)
-                self._logger.debug(
-                    "Chamber is not convened without scheduled convening. Next update - {}".format(self.next_update))
-                return None
+                self._idle_interval = min(self._idle_interval * self._idle_backoff, self._idle_interval_max)
+            self._idle_mark = mark
+        self._next_update = self._compute_next_update(now, self.convened, self.convenes_at(), self._updated,
+                                                      self._idle_interval)
+        self._next_update_ts = self._next_update.timestamp()
+        self._logger.debug("Chamber convened is %s. Next update - %s", self.convened, self.next_update)
+        return self._next_update
 
+    @staticmethod
+    def _compute_next_update(now, convened, convenes_at, updated, idle_interval=_TEN_MIN):
+        """
+        Work out when the next update should happen.
+
+        :param now: Current time.
+        :type now: datetime
+        :param convened: Is the chamber convened?
+        :type convened: bool or str
+        :param convenes_at: When the chamber next convenes, if known.
+        :type convenes_at: datetime or None
+        :param updated: When the chamber was last updated.
+        :type updated: datetime
+        :param idle_interval: How long to wait when not convened and no convening is scheduled.
+        :type idle_interval: timedelta
+        :return: datetime
+        """
+        if convened:
+            # Convened, check every couple minutes.
+            return (updated + _TWO_MIN).replace(second=0, microsecond=0)
+        elif convenes_at is not None:
+            # If we know when the chamber next convenes, the next check should be ten minutes before that. If that's
+            # already passed, the convening was missed, so check again in a minute.
+            preconvene_target = convenes_at - _TEN_MIN
+            if preconvene_target < now:
+                return updated + _SIXTY_SEC
+            else:
+                return preconvene_target
+        else:
+            # Not convened without a scheduled convening.
+            return updated + idle_interval
+
+    @abc.abstractmethod
     def update(self, force=False):
         """
         Perform an update of data sources.
@@ -265,8 +484,8 @@ class Chamber:
         :type force: bool
         :return: datetime
         """
-        raise NotImplemented("Must be implemented by a specific base class.")
 
+    @abc.abstractmethod
     def _load(self):
         """
         Chamber internal load method. Fetches from source(es) and produces correct data.
@@ -274,8 +493,6 @@ class Chamber:
         :return: None
         """
 
-        raise NotImplemented("Must be implemented by a specific base class.")
-
     def load_cache(self):
         """
         Load the event log from a specified cache file.
@@ -284,112 +501,407 @@ class Chamber:
             with open(self.cache_path, 'rb') as cache_fh:
                 status = pickle.load(cache_fh)
         except FileNotFoundError as fnfe:
-            self._logger.warning("Cache file not found.")
+            self._logger.info("Cache does not exist.")
             return False
         else:
             # Assign the cached events to the events log.
-            self._events = status['events']
+            if 'events' in status:
+                # Cache from before the columnar format.
+                self._events = status['events']
+            else:
+                self._events = self._unpack_events(status)
+            self._rebuild_index()
+            self._cache_token += 1
             self._updated = status['updated']
             self._next_update = status['next_update']
+            self._next_update_ts = self._next_update.timestamp() if self._next_update is not None else float('-inf')
+            self._missing = status.get('missing', {})
             return True
 
     def save_cache(self):
         """
         Save the event log to a cache file.
         """
-        self._logger.debug(f"Saving cache data to '{self.cache_path}'.")
-        new_cache = self.cache_path.parent / f"{self.cache_path.name}.new"
-
-        with open(new_cache, 'wb') as nc_fh:
-            status = {
-                'events': self._events,
-                'updated': self._updated,
-                'next_update': self.next_update
-            }
-            #json.dump(self._events, new_cache)
-            pickle.dump(status, nc_fh)
-        # New cache successfully written. Remove old cache.
+        self._logger.debug("Saving cache data to '%s'.", self.cache_path)
+        new_cache = self._new_cache_path
+
+        status = self._pack_events()
+        status['updated'] = self._updated
+        status['next_update'] = self.next_update
+        # Days found missing longer ago than the walk-back reaches will never be asked for again, so don't keep them.
+        oldest = time.time() - self._max_days_back * 86400
+        self._missing = {url: found for url, found in self._missing.items() if found >= oldest}
+        status['missing'] = self._missing
+        # Same for validators. Each day has its own URL, so they'd otherwise pile up for the life of the process.
+        self._validators = {url: validators for url, validators in self._validators.items() if validators[3] >= oldest}
+        self._prune_journals(oldest)
+        # Pickle in memory and write it out in one go, rather than letting pickle trickle it out in small writes.
+        data = pickle.dumps(status, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(new_cache, 'wb', buffering=0) as nc_fh:
+            nc_fh.write(data)
+        # New cache successfully written. Atomically swap it in over the old cache.
+        os.replace(new_cache, self.cache_path)
+
+    def _prune_journals(self, oldest):
+        """
+        Delete kept journals written before a cutoff. A journal is only kept once it's final, so by the time it's been
+        on disk for the maximum days back, the walk-back won't ask for it again.
+
+        :param oldest: Cutoff, as a POSIX timestamp. Files last written before this are deleted.
+        :type oldest: float
+        :return: None
+        """
         try:
-            os.remove(self.cache_path)
+            with os.scandir(self._journal_path) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < oldest:
+                        os.remove(entry.path)
         except FileNotFoundError:
+            # Nothing has been kept yet.
             pass
-        # Move the new cache into the correct place.
-        os.rename(new_cache, self.cache_path)
+        except OSError as ose:
+            self._logger.warning("Could not prune kept journals in '%s' - %s", self._journal_path, ose)
+
+    def _pack_events(self):
+        """
+        Pack the event log into columns for the cache. Timestamps become epoch microseconds and types become bytes, both
+        in packed arrays. All other event fields go in a per-event side table.
 
-    def _search_events(self, timestamp=None, search_forward=False, types=None):
+        :return: dict
+        """
+        timestamps = array('q')
+        types = array('b')
+        extras = []
+        for event in self._events:
+            timestamps.append((event['timestamp'] - _UNIX_EPOCH) // _ONE_MICROSECOND)
+            extra = {key: value for key, value in event.items() if key not in ('timestamp', 'type')}
+            event_type = event.get('type')
+            if isinstance(event_type, int) and 0 <= event_type <= 127:
+                types.append(event_type)
+            else:
+                # Missing or odd types are kept as-is in the side table.
+                types.append(-1)
+                if 'type' in event:
+                    extra['type'] = event_type
+            extras.append(extra)
+        return {
+            'format': _CACHE_FORMAT,
+            'timestamps': timestamps.tobytes(),
+            'types': types.tobytes(),
+            'extras': extras
+        }
+
+    @staticmethod
+    def _unpack_events(status):
+        """
+        Rebuild the event log from a packed cache.
+
+        :param status: Loaded cache data.
+        :type status: dict
+        :return: list
+        """
+        timestamps = array('q')
+        timestamps.frombytes(status['timestamps'])
+        types = array('b')
+        types.frombytes(status['types'])
+        events = []
+        for timestamp, event_type, extra in zip(timestamps, types, status['extras']):
+            event = dict(extra)
+            event['timestamp'] = (_UNIX_EPOCH + timestamp * _ONE_MICROSECOND).astimezone(_DCTZ)
+            if event_type >= 0:
+                event['type'] = event_type
+            events.append(event)
+        return events
+
+    def _search_events(self, target_dt=None, search_forward=False, types=_ALL_EVENT_TYPES):
         """
         Search for events based on critera.
 
-        :param timestamp: Timestamp to use as a reference. Defaults to now.
-        :param timestamp: datetime or None
+        :param target_dt: Timestamp to use as a reference. Defaults to now.
+        :type target_dt: datetime or None
         :param search_forward: Search for future events if set. By default, will only search for past events.
         :type search_forward: bool
-        :param types: Types of events to include. If not specified, will search all.
-        :type types: list or int
+        :param types: Types of events to include. If not specified, will search all. Pass a frozenset to skip
+        normalization.
+        :type types: frozenset, list or int
         :return:
         """
-        # self._logger.debug("Available events: {}".format(self._events))
-        # self._logger.debug("Timestamp: {}".format(timestamp))
-        # self._logger.debug("Search Forward: {}".format(search_forward))
-        # self._logger.debug("Types: {}".format(types))
+        # if self._logger.isEnabledFor(logging.DEBUG):
+        #     self._logger.debug("Available events: %s", self._events)
+        #     self._logger.debug("Timestamp: %s", target_dt)
+        #     self._logger.debug("Search Forward: %s", search_forward)
+        #     self._logger.debug("Types: %s", types)
+
+        if target_dt is None:
+            target_dt = datetime.now(_UTC)
+        types = _normalize_types(types)
 
         selected_event = None
-        # Input checking.
-        if isinstance(timestamp, datetime):
-            target_dt = timestamp
+        # Each type's events are sorted by timestamp, so bisect for the closest event of each type and then pick the
+        # closest of those.
+        # The bisects run over the plain timestamp lists, so the comparisons stay in C.
+        selected_ts = None
+        index_get = self._events_by_type.get
+        for event_type in types:
+            entry = index_get(event_type)
+            if entry is None:
+                continue
+            timestamps, typed_events = entry
+            if search_forward:
+                i = bisect_left(timestamps, target_dt)
+                if i < len(timestamps) and (selected_ts is None or timestamps[i] < selected_ts):
+                    selected_ts = timestamps[i]
+                    selected_event = typed_events[i]
+            else:
+                i = bisect_right(timestamps, target_dt)
+                if i > 0 and (selected_ts is None or timestamps[i - 1] > selected_ts):
+                    selected_ts = timestamps[i - 1]
+                    selected_event = typed_events[i - 1]
+        return selected_event
+
+    # Searches for the single types the base class needs.
+    _latest_convene = _mk_search(CONVENE, False)
+    _latest_adjourn = _mk_search(ADJOURN, False)
+    _next_convene_scheduled = _mk_search(CONVENE_SCHEDULED, True)
+
+    @_token_cached
+    def _latest_convene_and_adjourn(self):
+        """
+        Find the latest convening and the latest adjournment together. convened, convened_at and adjourned_at all
+        need both, so this is shared between them rather than each searching separately.
+
+        :return: Tuple of the latest convene event and the latest adjourn event. Either may be None.
+        :rtype: tuple
+        """
+        if not self._events:
+            return None, None
+        now = datetime.now(_UTC)
+        return self._latest_convene(now), self._latest_adjourn(now)
+
+    def _add_event(self, event):
+        """
+        Add an event to the event log. All additions to the log should go through here so the search index is kept
+        current.
+
+        :param event: Event to add.
+        :type event: dict
+        :return: None
+        """
+        insort(self._events, event, key=_TIMESTAMP)
+        self._cache_token += 1
+        self._log_revision += 1
+        if event.get('id') is not None:
+            self._events_by_id[event['id']] = event
+        try:
+            timestamps, typed_events = self._events_by_type[event['type']]
+        except KeyError:
+            self._logger.warning("Event %s does not have type setting.", event.get('id'))
+            self._logger.warning("Event dump - %s", event)
         else:
-            target_dt = datetime.now(timezone.utc)
+            i = bisect_right(timestamps, event['timestamp'])
+            timestamps.insert(i, event['timestamp'])
+            typed_events.insert(i, event)
 
-        if types is None:
-            types = chambers.const.ALL_EVENTS
-        elif type(types) in (str, int):
-            # If a string, make it a list of one.
-            types = [types]
+    def _remove_event(self, event):
+        """
+        Remove an event from the event log and the search index.
 
-        for event in self._events:
-            # print("Checking event: {}".format(event))
-            try:
-                if event['type'] in types:
-                    if search_forward and event['timestamp'] >= target_dt:
-                        if selected_event is None:
-                            selected_event = event
-                        elif event['timestamp'] < selected_event['timestamp']:
-                            selected_event = event
-                    elif not search_forward and event['timestamp'] <= target_dt:
-                        if selected_event is None:
-                            selected_event = event
-                        elif event['timestamp'] > selected_event['timestamp']:
-                            selected_event = event
-            except KeyError:
-                self._logger.warning("Event {} does not have type setting.".format(event['id']))
-                self._logger.warning("Event dump - {}".format(event))
-        return selected_event
+        :param event: Event to remove. Must be an event object that's in the log.
+        :type event: dict
+        :return: None
+        """
+        self._cache_token += 1
+        self._log_revision += 1
+        i = bisect_left(self._events, event['timestamp'], key=_TIMESTAMP)
+        while i < len(self._events):
+            if self._events[i] is event:
+                del self._events[i]
+                break
+            i += 1
+        if self._events_by_id.get(event.get('id')) is event:
+            del self._events_by_id[event['id']]
+        entry = self._events_by_type.get(event.get('type'))
+        if entry is not None:
+            timestamps, typed_events = entry
+            i = bisect_left(timestamps, event['timestamp'])
+            while i < len(typed_events):
+                if typed_events[i] is event:
+                    del timestamps[i]
+                    del typed_events[i]
+                    break
+                i += 1
 
-    def _sort_events(self):
+    def _event_at(self, timestamp):
         """
-        Sort the list of events by timestamp.
+        Find the first event in the log at exactly the given time.
 
-        :return:
+        :param timestamp: Time to look for.
+        :type timestamp: datetime
+        :return: dict or None
         """
-        self._events = sorted(self._events, key=itemgetter('timestamp'), reverse=True)
+        i = bisect_left(self._events, timestamp, key=_TIMESTAMP)
+        if i < len(self._events) and self._events[i]['timestamp'] == timestamp:
+            return self._events[i]
+        return None
 
-    def _trim_event_log(self):
+    def _rebuild_index(self):
+        """
+        Rebuild the search index from the event log. Needed whenever the event log is replaced wholesale. Also puts the
+        log itself back in timestamp order, since older caches stored it newest first.
+
+        :return: None
+        """
+        self._cache_token += 1
+        self._events.sort(key=_TIMESTAMP)
+        self._events_by_type = defaultdict(_new_index_entry)
+        self._events_by_id = {}
+        for event in self._events:
+            if event.get('id') is not None:
+                self._events_by_id[event['id']] = event
+            if 'type' in event:
+                timestamps, typed_events = self._events_by_type[event['type']]
+                timestamps.append(event['timestamp'])
+                typed_events.append(event)
+
+    def _trim_event_log(self, now=None):
         """
         Trim the event log.
 
+        :param now: Current time, if the caller already has it. Defaults to now.
+        :type now: datetime
         :return:
         """
-        delete_targets = []
-        limit = datetime.now(timezone.utc) - timedelta(days=1)
+        if now is None:
+            now = datetime.now(_UTC)
+        limit = now - _ONE_DAY
         limit = limit.replace(hour=0,minute=0,second=0,microsecond=0)
-        self._logger.info("Considering all events older than {}".format(limit))
-        i = 0
-        while i < len(self._events):
-            if self._events[i]['timestamp'] < limit:
-                delete_targets.append(i)
-            i += 1
-
-        self._logger.info("Will remove {} events.".format(len(delete_targets)))
-        for item in sorted(delete_targets, reverse=True):
-            if item > 2:
-                self._events.pop(item)
+        self._logger.info("Considering all events older than %s", limit)
+        # The log is in timestamp order, so everything before the limit is a single slice off the front. The three
+        # newest events are always kept.
+        cut = min(bisect_left(self._events, limit, key=_TIMESTAMP), max(len(self._events) - 3, 0))
+        self._logger.info("Will remove %d events.", cut)
+        del self._events[:cut]
+        self._rebuild_index()
+
+    def _get(self, url, allow_redirects=True):
+        """
+        Conditional GET of a URL. If an earlier response for the URL gave an ETag or Last-Modified, they're sent back so
+        the server can answer with a 304 Not Modified when nothing has changed. Events are never dropped between loads,
+        so on a 304 the caller can skip parsing and keep what it already has. For chambers that replay unchanged
+        documents, a 304 instead comes back as a stand-in 200 with the body kept from the last full response.
+
+        :param url: URL to fetch.
+        :type url: str
+        :param allow_redirects: Follow redirects. If not, a redirect comes back as the response itself.
+        :type allow_redirects: bool
+        :return: The response.
+        :rtype: requests.Response
+        """
+        headers = {}
+        etag, last_modified, body, _ = self._validators.get(url, (None, None, None, None))
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+        response = self._session.get(url, headers=headers, timeout=self._http_timeout, allow_redirects=allow_redirects)
+        if response.status_code == 304 and body is not None:
+            return _KeptResponse(url, body)
+        # Only keep validators from a direct, full response. A redirect lands on some other page (ie: the Senate's 404
+        # page), and its validators don't describe the URL asked for.
+        if response.status_code == 200 and not response.history:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag is not None or last_modified is not None:
+                self._validators[url] = (etag, last_modified, response.content if self._replay_unchanged else None,
+                                         time.time())
+        return response
+
+    def _get_kept(self, url, allow_redirects=True):
+        """
+        GET of a journal that's final and won't change. A copy is kept on disk the first time it's fetched, and read
+        back from there afterward, including after a restart.
+
+        :param url: URL to fetch.
+        :type url: str
+        :param allow_redirects: Follow redirects. If not, a redirect comes back as the response itself.
+        :type allow_redirects: bool
+        :return: The response, or a stand-in for it if read from disk.
+        """
+        kept_file = self._journal_path / (url.rsplit('/', 1)[-1] + '.cache')
+        try:
+            content = kept_file.read_bytes()
+        except OSError:
+            content = b''
+        if content:
+            return _KeptResponse(url, content)
+        response = self._get(url, allow_redirects)
+        # Only keep a direct, full response. Missing days and redirects are checked again next time.
+        if response.status_code == 200 and not response.history and response.content:
+            try:
+                self._journal_path.mkdir(exist_ok=True)
+                new_file = kept_file.parent / f"{kept_file.name}.new"
+                with open(new_file, 'wb', buffering=0) as nf_fh:
+                    nf_fh.write(response.content)
+                os.replace(new_file, kept_file)
+            except OSError as ose:
+                self._logger.warning("Could not keep journal '%s' - %s", url, ose)
+        return response
+
+    def _is_missing(self, response):
+        """
+        Does this response say the day has no data? Defaults to a plain 404. Chambers that report missing days some
+        other way should override this.
+
+        :param response: The response for a day.
+        :type response: requests.Response
+        :return: bool
+        """
+        return response.status_code == 404
+
+    def _fetch_days(self, url_for_day, start=0, final_from=None, allow_redirects=True, first_window=2):
+        """
+        Fetch data for each day going back from today, in order. Days are fetched concurrently, a window at a time, so
+        a run of missing days costs about one round trip per window rather than one per day. Windows start small, two
+        days by default, and double up to the probe window, so the common case of only needing yesterday doesn't fetch a
+        week.
+
+        The caller should stop iterating as soon as it has what it needs. Fetches already in flight are allowed to
+        finish, but no further windows are started. Either way, nothing further back than the maximum days back is
+        fetched.
+
+        :param url_for_day: Function that gives the URL to fetch for a given number of days before today.
+        :type url_for_day: function
+        :param start: Number of days before today to start at.
+        :type start: int
+        :param final_from: Days at least this far back are final. They're kept on disk once fetched, and if missing,
+            are remembered as missing and skipped from then on. None treats no day as final.
+        :type final_from: int
+        :param allow_redirects: Follow redirects. Chambers that answer missing days with a redirect can turn this off to
+            see the redirect itself and not download whatever it points at.
+        :type allow_redirects: bool
+        :param first_window: Days in the first window. Callers that know they need at least some number of days can
+            fetch them all at once.
+        :type first_window: int
+        :return: Generator of each day's offset and its response. Days known to be missing are left out.
+        """
+        def fetch(days_back):
+            url = url_for_day(days_back)
+            if final_from is None or days_back < final_from:
+                return self._get(url, allow_redirects)
+            if url in self._missing:
+                return None
+            response = self._get_kept(url, allow_redirects)
+            if self._is_missing(response):
+                self._missing[url] = time.time()
+            return response
+
+        i = start
+        window = max(1, min(first_window, self._probe_window))
+        with ThreadPoolExecutor(max_workers=self._probe_window) as executor:
+            while i < self._max_days_back:
+                days = range(i, min(i + window, self._max_days_back))
+                for days_back, response in zip(days, executor.map(fetch, days)):
+                    if response is not None:
+                        yield days_back, response
+                i += window
+                window = min(window * 2, self._probe_window)
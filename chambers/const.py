@@ -16,7 +16,8 @@ DEBATE_BILL = 11
 VOTE_VOICE = 21
 VOTE_RECORDED = 22
 
-# Event Groups
-ALL_EVENTS = (CONVENE, RECONVENE, ADJOURN, RECESS_TIME, RECESS_COC, MORNING_DEBATE, DEBATE_BILL, VOTE_VOICE, VOTE_RECORDED)
-RECESS = (RECESS_TIME, RECESS_COC)
-VOTE = (VOTE_VOICE, VOTE_RECORDED)
\ No newline at end of file
+# Event Groups. Frozensets, so they can be passed straight to searches and membership is a hash lookup.
+ALL_EVENTS = frozenset((CONVENE, RECONVENE, ADJOURN, RECESS_TIME, RECESS_COC, MORNING_DEBATE, DEBATE_BILL, VOTE_VOICE,
+                        VOTE_RECORDED))
+RECESS = frozenset((RECESS_TIME, RECESS_COC))
+VOTE = frozenset((VOTE_VOICE, VOTE_RECORDED))
\ No newline at end of file
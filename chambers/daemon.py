@@ -12,15 +12,42 @@ import pathlib
 from random import randint
 import signal
 import sys
+import threading
 import time
 
+# orjson is optional. It's a good deal faster and hands back bytes paho can send as-is.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(payload):
+    """ Serialize to JSON, with orjson if it's available. """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    else:
+        return json.dumps(payload)
+
+
 class ChamberWatcher:
     """
     Class to monitor the US Congress. Create one, then run it.
     """
+    # Home Assistant entities created for each chamber. Key in the state message, name suffix, component, object ID
+    # and any extra configuration.
+    _CHAMBER_ENTITIES = (
+        ('convened', 'Convened', 'binary_sensor', 'chambers_{chamber}_convened',
+         {'payload_on': 'True', 'payload_off': 'False'}),
+        ('adjourned_at', 'Adjourned At', 'sensor', '{chamber}_adjourned_at', {'device_class': 'timestamp'}),
+        ('convened_at', 'Convened At', 'sensor', '{chamber}_convened_at', {'device_class': 'timestamp'}),
+        ('convenes_at', 'Convenes At', 'sensor', '{chamber}_convenes_at', {'device_class': 'timestamp'}),
+        ('next_update', 'Next Update', 'sensor', '{chamber}_next_update', {'device_class': 'timestamp'})
+    )
+
     def __init__(self, mqtt_host, mqtt_username, mqtt_password, mqtt_port=1883, mqtt_qos=0,
                  mqtt_client_id = 'chambers', mqtt_base = 'chambers', ha_base = 'homeassistant', log_level=logging.WARNING,
-                 log_mqtt=False):
+                 log_mqtt=False, legacy_topics=False):
         """
         :param mqtt_host: MQTT host to connect to.
         :type mqtt_host: str
@@ -42,6 +69,8 @@ class ChamberWatcher:
         :type log_level: str
         :param log_mqtt: Should MQTT logging be enabled? If True, a logger will be attached to the client object and set to debug. Likely only needed for development.
         :type log_mqtt: bool
+        :param legacy_topics: Also publish each value to its own topic, in addition to the combined state topic. Only needed for consumers of the old per-value topics.
+        :type legacy_topics: bool
         """
 
         # Set up the logger!
@@ -69,12 +98,34 @@ class ChamberWatcher:
         self._mqtt_qos = mqtt_qos
         self._mqtt_base = mqtt_base
         self._ha_base = ha_base
+        self._legacy_topics = legacy_topics
 
         # Make default variables.
         self._mqtt_status = 'disconnected'
         self._ha_status = 'offline'
         self._last_connect = 0
         self._next_cache_write = datetime(1900, 1, 1, 0, 0, 0)
+        # Set by the MQTT callbacks to wake the run loop early when the connection state changes.
+        self._wake = threading.Event()
+
+        # Topics dictionary. Built once here, since the base can't change after initialization.
+        self._topics = {
+            "running": f"{self._mqtt_base}/running",
+            "house_state": f"{self._mqtt_base}/house/state",
+            "house_convened": f"{self._mqtt_base}/house/convened",
+            "house_next_update": f"{self._mqtt_base}/house/next_update",
+            "house_adjourned_at": f"{self._mqtt_base}/house/adjourned_at",
+            "house_convened_at": f"{self._mqtt_base}/house/convened_at",
+            "house_convenes_at": f"{self._mqtt_base}/house/convenes_at",
+            "senate_state": f"{self._mqtt_base}/senate/state",
+            "senate_convened": f"{self._mqtt_base}/senate/convened",
+            "senate_next_update": f"{self._mqtt_base}/senate/next_update",
+            "senate_adjourned_at": f"{self._mqtt_base}/senate/adjourned_at",
+            "senate_convened_at": f"{self._mqtt_base}/senate/convened_at",
+            "senate_convenes_at": f"{self._mqtt_base}/senate/convenes_at"
+        }
+        # Home Assistant discovery messages, ready to send.
+        self._discovery_payloads = self._build_discovery_payloads()
 
         # Make the client.
         self._create_mqtt_client()
@@ -113,6 +164,10 @@ class ChamberWatcher:
             username=self._mqtt_username,
             password=self._mqtt_password
         )
+        # Allow more messages in flight, so a burst of status and discovery messages at QoS 1 or 2 doesn't queue behind
+        # the broker's acknowledgements. The outbound queue is unlimited.
+        self._mqtt_client.max_inflight_messages_set(100)
+        self._mqtt_client.max_queued_messages_set(0)
         # Set last will
         self._mqtt_client.will_set(self._topics["running"], payload="false", qos=self._mqtt_qos, retain=True)
         # Connect callbacks.
@@ -133,6 +188,7 @@ class ChamberWatcher:
         if rc != "Success":
             self._logger.error(f"MQTT Connection failed immediately. Cause: '{rc}'")
             self._mqtt_status = "connfail"
+            self._wake.set()
         else:
             self._logger.info("Connected to MQTT Broker.")
             # Set connection status to connected.
@@ -146,6 +202,8 @@ class ChamberWatcher:
             # self._mqtt_client.on_message = self._on_message
             # Run Home Assistant Discovery
             self._ha_discovery()
+            # Let the run loop start updating.
+            self._wake.set()
 
     def _on_disconnect(self, client, userdata, flags, rc, properties=None):
         """
@@ -169,6 +227,7 @@ class ChamberWatcher:
             self._send_offline()
         # self._reconnect_timer = time.monotonic()
         self._mqtt_client.loop_stop()
+        self._wake.set()
 
     def _on_hachange(self, client, userdata, message):
         """
@@ -212,7 +271,7 @@ class ChamberWatcher:
 
         # Convert to JSON if requested, ignore all other conversion.
         if send_json:
-            outbound_message = json.dumps(payload)
+            outbound_message = _json_dumps(payload)
         elif isinstance(payload, datetime):
             # Convert datetimes to an ISO format string.
             outbound_message = payload.isoformat()
@@ -232,34 +291,13 @@ class ChamberWatcher:
         # Publish it!
         self._mqtt_client.publish(topic, payload=outbound_message, retain=retain)
 
-    @property
-    def _topics(self):
-        """
-        Topics dictionary property. Only accses this after initialization since these defintions are context-dependent.
-
-        :return: Dictionary of full topic targets.
-        :rtype: dict
-        """
-        return {
-            "running": f"{self._mqtt_base}/running",
-            "house_convened": f"{self._mqtt_base}/house/convened",
-            "house_next_update": f"{self._mqtt_base}/house/next_update",
-            "house_adjourned_at": f"{self._mqtt_base}/house/adjourned_at",
-            "house_convened_at": f"{self._mqtt_base}/house/convened_at",
-            "house_convenes_at": f"{self._mqtt_base}/house/convenes_at",
-            "senate_convened": f"{self._mqtt_base}/senate/convened",
-            "senate_next_update": f"{self._mqtt_base}/senate/next_update",
-            "senate_adjourned_at": f"{self._mqtt_base}/senate/adjourned_at",
-            "senate_convened_at": f"{self._mqtt_base}/senate/convened_at",
-            "senate_convenes_at": f"{self._mqtt_base}/senate/convenes_at"
-        }
-
     def run(self):
         """
         Main run loop.
         """
         self._logger.debug("Entering run loop.")
         while True:
+            self._wake.clear()
             if self._mqtt_status == 'disconnected':
                 if time.monotonic() - self._last_connect >= 10:
                     result = self.connect()
@@ -268,9 +306,10 @@ class ChamberWatcher:
                         self._send_senate()
                     else: # Otherwise, reset and wait 10s to connect again.
                         self._last_connect = time.monotonic()
+                sleep_time = 10 - (time.monotonic() - self._last_connect)
             elif self._mqtt_status in ('connecting','disconnected-planned'):
                 # Wait for the connection to be acknowledged.
-                pass
+                sleep_time = 1
             else:
                 # Update the House.
                 if self._house.update():
@@ -282,10 +321,26 @@ class ChamberWatcher:
                 if datetime.now() > self._next_cache_write:
                    self._logger.info("Cache deadline passed. Saving caches.")
                    self._save_caches()
+                sleep_time = self._time_to_next_task()
+            # Nothing to do until the next task is due, so sleep until then. The MQTT callbacks cut this short if the
+            # connection changes.
+            self._wake.wait(min(max(sleep_time, 1), 60))
+
+    def _time_to_next_task(self):
+        """
+        Seconds until a chamber is due to update or the caches are due to be saved, whichever is first.
 
-    @property
-    def __class__(self):
-        return super().__class__
+        :return: float
+        """
+        # One clock read for all the deadlines. Epoch seconds work for both the local cache time and the chambers' aware
+        # update times.
+        now = time.time()
+        sleep_time = self._next_cache_write.timestamp() - now
+        for chamber in (self._house, self._senate):
+            if chamber.next_update is None:
+                return 0
+            sleep_time = min(sleep_time, chamber.next_update.timestamp() - now)
+        return sleep_time
 
     # System Signal Handling
     def _register_signal_handlers(self):
@@ -393,27 +448,40 @@ class ChamberWatcher:
         Send the current House status to the Broker.
         :return:
         """
-
-        self._pub_message(self._topics['house_convened'], self._house.convened)
-        # self._logger.debug("Will send House Adjourned At '{}' ({})".format(self._house.adjourned_at(), type(self._house.adjourned_at())))
-        self._pub_message(self._topics['house_adjourned_at'], self._house.adjourned_at())
-        self._pub_message(self._topics['house_convened_at'], self._house.convened_at())
-        self._pub_message(self._topics['house_convenes_at'], self._house.convenes_at())
-        self._logger.info("House next update: {} ({})".format(self._house.next_update, type(self._house.next_update)))
-        self._pub_message(self._topics['house_next_update'], self._house.next_update)
+        self._send_chamber('house', self._house)
 
     def _send_senate(self):
         """
         Send the current Senate status to the Broker.
         :return:
         """
-        self._pub_message(self._topics['senate_convened'], self._senate.convened)
-        self._pub_message(self._topics['senate_adjourned_at'], self._senate.adjourned_at())
-        self._pub_message(self._topics['senate_convened_at'], self._senate.convened_at())
-        self._pub_message(self._topics['senate_convenes_at'], self._senate.convenes_at())
-        self._logger.info(
-            "Senate next update: {} ({})".format(self._senate.next_update, type(self._senate.next_update)))
-        self._pub_message(self._topics['senate_next_update'], self._senate.next_update)
+        self._send_chamber('senate', self._senate)
+
+    def _send_chamber(self, name, chamber):
+        """
+        Send a chamber's status to the Broker. All values go out together as one JSON message on the chamber's state
+        topic, and to the individual value topics as well if legacy topics are enabled.
+
+        :param name: Name of the chamber, as used in the topics.
+        :type name: str
+        :param chamber: Chamber object to send the status of.
+        :type chamber: chambers.Chamber
+        :return:
+        """
+        values = {
+            'convened': chamber.convened,
+            'adjourned_at': chamber.adjourned_at(),
+            'convened_at': chamber.convened_at(),
+            'convenes_at': chamber.convenes_at(),
+            'next_update': chamber.next_update
+        }
+        self._logger.info("{} next update: {} ({})".format(
+            name.capitalize(), values['next_update'], type(values['next_update'])))
+        state = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in values.items()}
+        self._pub_message(self._topics[f"{name}_state"], state, send_json=True)
+        if self._legacy_topics:
+            for key, value in values.items():
+                self._pub_message(self._topics[f"{name}_{key}"], value)
 
     def _send_online(self):
         """
@@ -444,94 +512,50 @@ class ChamberWatcher:
 
         :return:
         """
+        for discovery_topic, discovery_payload in self._discovery_payloads:
+            self._mqtt_client.publish(discovery_topic, payload=discovery_payload)
 
-        discovery_dict = {
-            'name': "Running",
-            'object_id': "chambers_running",
-            'device': self._ha_device_info(),
-            'device_class': 'running',
-            'unique_id': f"{self._client_id}_running",
-            'state_topic': self._topics['running'],
-            'icon': 'mdi:play',
-            'payload_on': 'true',
-            'payload_off': 'false'
-        }
-        discovery_topic = f"{self._ha_base}/binary_sensor/{self._client_id}/running/config"
-        self._pub_message(discovery_topic, discovery_dict, send_json=True)
-        # self._mqtt_client.publish(discovery_topic, discovery_json, True)
-        # self._topics_outbound['connectivity']['discovery_time'] = time.monotonic()
-
-        for chamber in ('house', 'senate'):
-            convened_dict = {
-                'name': f"{chamber.capitalize()} Convened",
-                'object_id': f"chambers_{chamber}_convened",
-                'device': self._ha_device_info(),
-                'unique_id': f"{self._client_id}_{chamber}_convened",
-                'state_topic': self._topics[f"{chamber}_convened"],
-                'payload_on': 'True',
-                'payload_off': 'False',
-                'availability': self._ha_availability()
-            }
-
-            self._pub_message(
-                f"{self._ha_base}/binary_sensor/{self._client_id}/{chamber}_convened/config",
-                convened_dict, send_json=True)
-
-            adjourned_at_dict = {
-                'name': f"{chamber.capitalize()} Adjourned At",
-                'object_id': f"{chamber}_adjourned_at",
-                'device': self._ha_device_info(),
-                'unique_id': f"{self._client_id}_{chamber}_adjourned_at",
-                'state_topic': self._topics[f"{chamber}_adjourned_at"],
-                'device_class': 'timestamp',
-                'availability': self._ha_availability()
-            }
-
-            self._pub_message(
-                f"{self._ha_base}/sensor/{self._client_id}/{chamber}_adjourned_at/config",
-                adjourned_at_dict, send_json=True)
-
-            convened_at_dict = {
-                'name': f"{chamber.capitalize()} Convened At",
-                'object_id': f"{chamber}_convened_at",
-                'device': self._ha_device_info(),
-                'unique_id': f"{self._client_id}_{chamber}_convened_at",
-                'state_topic': self._topics[f"{chamber}_convened_at"],
-                'device_class': 'timestamp',
-                'availability': self._ha_availability()
-            }
+    def _build_discovery_payloads(self):
+        """
+        Build the Home Assistant discovery messages. These only depend on settings fixed at initialization, so this is
+        done once and the results are reused by every discovery run.
 
-            self._pub_message(
-                f"{self._ha_base}/sensor/{self._client_id}/{chamber}_convened_at/config",
-                convened_at_dict, send_json=True)
-
-            convenes_at_dict = {
-                'name': f"{chamber.capitalize()} Convenes At",
-                'object_id': f"{chamber}_convenes_at",
-                'device': self._ha_device_info(),
-                'unique_id': f"{self._client_id}_{chamber}_convenes_at",
-                'state_topic': self._topics[f"{chamber}_convenes_at"],
-                'device_class': 'timestamp',
-                'availability': self._ha_availability()
-            }
+        :return: List of discovery topics and their serialized payloads.
+        :rtype: list
+        """
+        device_info = self._ha_device_info()
+        availability = self._ha_availability()
 
-            self._pub_message(
-                f"{self._ha_base}/sensor/{self._client_id}/{chamber}_convenes_at/config",
-                convenes_at_dict, send_json=True)
-
-            next_update_dict = {
-                'name': f"{chamber.capitalize()} Next Update",
-                'object_id': f"{chamber}_next_update",
-                'device': self._ha_device_info(),
-                'unique_id': f"{self._client_id}_{chamber}_next_update",
-                'state_topic': self._topics[f"{chamber}_next_update"],
-                'device_class': 'timestamp',
-                'availability': self._ha_availability()
+        payloads = [(
+            f"{self._ha_base}/binary_sensor/{self._client_id}/running/config",
+            {
+                'name': "Running",
+                'object_id': "chambers_running",
+                'device': device_info,
+                'device_class': 'running',
+                'unique_id': f"{self._client_id}_running",
+                'state_topic': self._topics['running'],
+                'icon': 'mdi:play',
+                'payload_on': 'true',
+                'payload_off': 'false'
             }
+        )]
 
-            self._pub_message(
-                f"{self._ha_base}/sensor/{self._client_id}/{chamber}_next_update/config",
-                next_update_dict, send_json=True)
+        for chamber in ('house', 'senate'):
+            for key, name, component, object_id, extra_config in self._CHAMBER_ENTITIES:
+                discovery_dict = {
+                    'name': f"{chamber.capitalize()} {name}",
+                    'object_id': object_id.format(chamber=chamber),
+                    'device': device_info,
+                    'unique_id': f"{self._client_id}_{chamber}_{key}",
+                    'state_topic': self._topics[f"{chamber}_state"],
+                    'value_template': f"{{{{ value_json.{key} }}}}",
+                    'availability': availability,
+                    **extra_config
+                }
+                payloads.append((f"{self._ha_base}/{component}/{self._client_id}/{chamber}_{key}/config", discovery_dict))
+
+        return [(topic, _json_dumps(payload)) for topic, payload in payloads]
 
     def _ha_availability(self):
         """
@@ -573,6 +597,7 @@ def chambers_cli():
     MQTT_QOS = os.getenv("MQTT_QOS") or 0
     LOGLEVEL = os.getenv("LOGLEVEL") or 'INFO'
     LOGMQTT = os.getenv("LOGMQTT") or False
+    LEGACY_TOPICS = os.getenv("LEGACY_TOPICS") or False
     CLEAR_CACHE = os.getenv("CLEAR_CACHE") or False
 
     LOGVAL = logging.getLevelName(LOGLEVEL.upper())
@@ -606,7 +631,8 @@ def chambers_cli():
         mqtt_base=MQTT_BASE,
         ha_base = MQTT_HABASE,
         log_level=LOGVAL,
-        log_mqtt=LOGMQTT
+        log_mqtt=LOGMQTT,
+        legacy_topics=LEGACY_TOPICS
     )
     cw.run()
 
@@ -3,19 +3,116 @@ House current status and calendar
 """
 import time
 
-import chambers.const
+from chambers.const import (ADJOURN, CONVENE, CONVENE_SCHEDULED, DEBATE_BILL, MORNING_DEBATE, OTHER, RECESS_15M,
+                             RECESS_COC, RECESS_TIME, RECONVENE, VOTE_RECORDED, VOTE_VOICE)
 from .chamber import Chamber
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import functools
+import io
+import itertools
 import logging
 
 import requests
-import xml.etree.ElementTree as ET
+# lxml is optional. It parses a good deal faster, and the rest of the code only uses the API it shares with ElementTree.
+try:
+    from lxml import etree as ET
+    # lxml can skip handing back the elements inside each action, since those are read through the action itself.
+    _ITERPARSE_OPTIONS = {'resolve_entities': False, 'no_network': True,
+                          'tag': ('floor_action', 'legislative_day_finished')}
+    # When only the end of day record is wanted, lxml can skip handing back everything else.
+    _EOD_ITERPARSE_OPTIONS = dict(_ITERPARSE_OPTIONS, tag='legislative_day_finished')
+
+    def _drop_read(element):
+        """
+        Drop the already read siblings before an element, so the emptied elements don't pile up under the root.
+
+        :param element: The element just handled.
+        :type element: lxml.etree._Element
+        :return: None
+        """
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_OPTIONS = {}
+    _EOD_ITERPARSE_OPTIONS = {}
+
+    def _drop_read(element):
+        """
+        ElementTree elements don't know their parent, so there's nothing to do here. Each is still cleared once read.
+
+        :param element: The element just handled.
+        :type element: xml.etree.ElementTree.Element
+        :return: None
+        """
+        pass
+
+
+# DC time, the zone all House timestamps are in. Bound here so each floor action doesn't look it up on the class.
+_DCTZ = Chamber._dctz
+
+# The same day's journal is parsed again every time it changes, so the same timestamps keep coming back. datetimes are
+# immutable, so the parsed ones can be handed out again.
+@functools.lru_cache(maxsize=4096)
+def _parse_compact(value, tz):
+    """
+    Parse one of the House's compact timestamps, 'YYYYMMDDTHH:MM' with optional ':SS'. fromisoformat takes this mix
+    of basic date and extended time as it is, and is much quicker than strptime or slicing out each field.
+
+    :param value: Timestamp string.
+    :type value: str
+    :param tz: Timezone the timestamp is in.
+    :type tz: zoneinfo.ZoneInfo
+    :return: datetime
+    """
+    if len(value) not in (14, 17) or value[8] != 'T':
+        raise ValueError("Timestamp '{}' is not in the House's compact format.".format(value))
+    return datetime.fromisoformat(value).replace(tzinfo=tz)
+
+# How to classify floor actions from their description. Only act-ids listed here are loaded. For each act-id, the first
+# marker found in the description gives the event type. An empty marker matches anything, so it catches the rest. The
+# note is just for logging.
+_DESCRIPTION_MATCHERS = {
+    'H20100': (
+        ('The House convened, returning from a recess', RECONVENE, "Return from Recess."),
+        ('The House convened, starting a new legislative day.', CONVENE, "New Legislative Day.")
+    ),
+    # Adjournments and Recesses get lumped together as an H61000
+    'H61000': (
+        ('The House adjourned', ADJOURN, "Adjournment."),
+        ('The Speaker announced that the House do now adjourn', ADJOURN, "Adjournment."),
+        ('The Speaker announced that the House do now recess. The next meeting is scheduled for',
+         RECESS_TIME, "Recess to time."),
+        ('The Speaker announced that the House do now recess. The next meeting is subject to the call of the Chair.',
+         RECESS_COC, "Recess to call of chair."),
+        ('The Speaker announced that the House do now recess for a period of less than 15 minutes.',
+         RECESS_15M, "Recess for less than 15m")
+    ),
+    'H8D000': (
+        ('MORNING-HOUR DEBATE', MORNING_DEBATE, "Morning Hour Debate."),
+        ('DEBATE - ', DEBATE_BILL, "Debate."),
+        ('', OTHER, "Other Debate.")
+    ),
+    'H37100': (
+        ('', VOTE_RECORDED, "Recorded Vote"),
+    ),
+    'H35000': (
+        ('', VOTE_VOICE, "Voice Vote"),
+    )
+}
+# Event types that are about a particular measure, and so carry its action item.
+_ACTION_ITEM_TYPES = frozenset((DEBATE_BILL, VOTE_RECORDED, VOTE_VOICE))
+
 
 class House(Chamber):
     """
     House current status and calendar
     """
     URL_BASE = "https://clerk.house.gov/floor/"
+    # A day's journal URL, as a strftime format, so it's built in one call.
+    _URL_FORMAT = URL_BASE + "%Y%m%d.xml"
 
     # Allowed event types.
     EVENT_TYPES = (
@@ -48,29 +145,32 @@ class House(Chamber):
         :return: datetime
         """
 
+        # Cached results are only good for one update cycle.
+        self._cache_token += 1
+        if not (force or self.next_update is None or len(self._events) == 0 or self._update_due()):
+            return False
+        now = datetime.now(timezone.utc)
         if force:
             # Always load if we're forced, or if we don't have any data yet.
             self._logger.info("Force load set, updating.")
             self._load()
-            self._set_next_update()
+            self._set_next_update(now)
             return True
         elif self.next_update is None:
             self._logger.info("Next update is not set. Probably need to update now! Loading.")
             self._load()
-            self._set_next_update()
+            self._set_next_update(now)
             return True
         elif len(self._events) == 0:
             self._logger.info("No events available at update. Loading.")
             self._load()
-            self._set_next_update()
+            self._set_next_update(now)
             return True
-        elif datetime.now(timezone.utc) > self.next_update:
+        else:
             self._logger.info("Update time has passed. Loading.")
             self._load()
-            self._set_next_update()
+            self._set_next_update(now)
             return True
-        else:
-            return False
 
     def activity(self, timestamp=None):
         """
@@ -82,12 +182,13 @@ class House(Chamber):
         """
         selected_event = None
 
+        now = datetime.now(timezone.utc)
         if isinstance(timestamp, datetime):
             target_dt = timestamp
         else:
-            target_dt = datetime.now(timezone.utc)
+            target_dt = now
 
-        if target_dt > datetime.now(timezone.utc):
+        if target_dt > now:
             selected_event = self._search_events(target_dt, search_forward=True)
         else:
             selected_event = self._search_events(target_dt)
@@ -102,51 +203,67 @@ class House(Chamber):
         :rtype: bool
         """
 
+        today = datetime.now()
         # Try to load today. Will 404 if House isn't in session yet.
-        target_url = House.URL_BASE + datetime.now().strftime('%Y%m%d') + ".xml"
-        self._logger.debug("Fetching House data from URL '{}'".format(target_url))
-        try:
-            today_response = requests.get(target_url)
-        except requests.exceptions.ConnectionError as ce:
-            self._logger.error(f"Exception while trying to retrieve today's journal - '{ce}'")
-            return False
-        else:
-            if today_response.ok:
-                self._logger.info("Loading today's House floor proceedings.")
-                # Response is okay, process it.
-                event_count = self._load_xml(today_response.content)
-                self._logger.info(f"Today's proceedings resulted in {event_count} events.")
+        target_url = today.strftime(House._URL_FORMAT)
+        self._logger.debug("Fetching House data from URL '%s'", target_url)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Today's journal and the previous days' don't depend on each other to be fetched, so today's is fetched in
+            # the background while the walk-back gets going. Today's is still handled first, since it decides how much
+            # of the previous day is needed.
+            today_fetch = executor.submit(self._get, target_url)
+            old_days = self._fetch_days(
+                lambda days_back: (today - timedelta(days=days_back)).strftime(House._URL_FORMAT),
+                start=1, final_from=2)
+            try:
+                # Starting the walk-back sends off its first requests, alongside today's.
+                first_day = next(old_days, None)
+                today_response = today_fetch.result()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as ce:
+                self._logger.error("Exception while trying to retrieve today's journal - '%s'", ce)
+                old_days.close()
+                return False
+
+        if today_response.status_code == 304:
+            # Unchanged since the last load, so its events are already in the log.
+            self._logger.info("Today's House floor proceedings are unchanged.")
+        elif today_response.ok:
+            self._logger.info("Loading today's House floor proceedings.")
+            # Response is okay, process it.
+            event_count = self._load_xml(today_response.content)
+            self._logger.info("Today's proceedings resulted in %d events.", event_count)
 
         # Load previous day
-        i = 1
-        found_response = False
         self._logger.debug("Attempting to load previous day's data.")
-
-        while not found_response:
-            target_url = House.URL_BASE + (datetime.now() - timedelta(days=i) ).strftime('%Y%m%d') + ".xml"
-            self._logger.debug("Fetching House data from URL '{}'".format(target_url))
-            old_response = requests.get(target_url)
-            if old_response.ok:
-                self._logger.info("Found floor proceedings for {}. Loading.".format(
-                    (datetime.now() - timedelta(days=i)).strftime('%d %b %Y')
-                ))
-                if today_response.ok:
-                    self._logger.info("Loading to extract adjournment.")
-                    # Load the previous legislative days' XML only to get the adjournment data.
-                    event_count = self._load_xml(old_response.content, only_eod=True)
-                    if event_count != 1:
-                        self._logger.error("Could not load adjournment from journal on {}".format(
-                            (datetime.now() - timedelta(days=i)).strftime('%d %b %Y')))
+        try:
+            for i, old_response in itertools.chain((first_day,) if first_day is not None else (), old_days):
+                self._logger.debug("Fetched House data from URL '%s'", old_response.url)
+                if old_response.status_code == 304:
+                    # Already loaded this day and it hasn't changed, so there's nothing more to do.
+                    self._logger.info("Floor proceedings for %s are unchanged.",
+                                      (today - timedelta(days=i)).strftime('%d %b %Y'))
+                    break
+                elif old_response.ok:
+                    search_date = (today - timedelta(days=i)).strftime('%d %b %Y')
+                    self._logger.info("Found floor proceedings for %s. Loading.", search_date)
+                    if today_response.ok:
+                        self._logger.info("Loading to extract adjournment.")
+                        # Load the previous legislative days' XML only to get the adjournment data.
+                        # A missing end of day record is logged by _load_xml. With none added, it's already in the log.
+                        if self._load_xml(old_response.content, only_eod=True):
+                            self._logger.info("Loaded adjournment from journal.")
+                        else:
+                            self._logger.debug("No new adjournment from journal on %s", search_date)
                     else:
-                        self._logger.info("Loaded adjournment from journal.")
-                else:
-                    event_count = self._load_xml(old_response.content)
-                    self._logger.info("Loaded {} events from journal on {}".format(event_count,(datetime.now()
-                            - timedelta(days=i)).strftime('%d %b %Y') ))
-                found_response = True
-            i += 1
-        self._logger.info("Sorting events.")
-        self._sort_events()
+                        event_count = self._load_xml(old_response.content)
+                        self._logger.info("Loaded %d events from journal on %s", event_count, search_date)
+                    break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as ce:
+            self._logger.error("Exception while trying to retrieve previous days' journals - '%s'", ce)
+            return False
+        finally:
+            # Done with the walk-back, so don't start any more of it.
+            old_days.close()
         # self._trim_event_log()
         self._updated = datetime.now(timezone.utc)
         self._logger.info("Load complete.")
@@ -157,49 +274,51 @@ class House(Chamber):
         Load a single XML file.
 
 
-        :param house_xml: The XML file from the House Floor site.
-        :type house_xml: str
+        :param house_xml: The XML file from the House Floor site. Passed to the parser as bytes, undecoded, so the
+            parser goes by the encoding the document declares.
+        :type house_xml: bytes
         :param only_eod: Only find the end of legislative day record from the XML file, if any.
         :type only_eod: bool
         :return: Number of items added or replaced.
         :rtype: int
         """
 
-        try:
-            house_tree = ET.fromstring(house_xml)
-        except ET.ParseError as xmlerror:
-            self._logger.error(f"Could not parse XML. Received error '{xmlerror}'. Skiping.")
-            return 0
         # Get the publication date for this file.
         # We don't seem to need this anymore?
         # pubdate = datetime.strptime(house_tree.find('pubDate').text[:-4], "%a, %d %b %Y %H:%M:%S")
         # pubdate = pubdate.replace(tzinfo=Chamber._dctz)
-        events = []
-        # Process all children.
+        # Stream through the file rather than building the whole tree. Each action is handled as soon as it's fully
+        # read, then cleared so its contents don't stay in memory.
         items = 0
-        for floor_action in house_tree.find('floor_actions'):
-            if floor_action.tag == 'legislative_day_finished':
-                if self._add_end_day(floor_action):
-                    items += 1
+        options = _EOD_ITERPARSE_OPTIONS if only_eod else _ITERPARSE_OPTIONS
+        try:
+            for _, floor_action in ET.iterparse(io.BytesIO(house_xml), events=('end',), **options):
+                if floor_action.tag == 'legislative_day_finished':
+                    if self._add_end_day(floor_action):
+                        items += 1
+                    floor_action.clear()
                     if only_eod:
                         return items # Can return here, since by definition there's only one end of day.
-            elif floor_action.tag == 'floor_action' and not only_eod:
-                # Breaking this out to make logging for debugging more details.
-                if floor_action.attrib['act-id'] == "H20100":
-                    self._logger.debug("Floor Action has id H20100 (Convene). Will add.".format(floor_action.attrib['act-id']))
-                    if self._add_floor_action(floor_action):
-                        items += 1
-                elif floor_action.attrib['act-id'] == "H61000":
-                    self._logger.debug("Floor Action has id H61000 (Adjourn/Recess). Will add.")
-                    if self._add_floor_action(floor_action):
-                        items += 1
-                elif floor_action.attrib['act-id'] == "H8D000":
-                    self._logger.debug("Floor Action has id H8D000 (Debate). Will add.")
-                    if self._add_floor_action(floor_action):
-                        items += 1
-                else:
-                    self._logger.debug("Floor Action has had {}. Skipping.".format(floor_action.attrib['act-id']))
-        self._logger.info("Processed all floor actions.")
+                elif floor_action.tag == 'floor_action' and not only_eod:
+                    act_id = floor_action.get('act-id')
+                    if act_id in _DESCRIPTION_MATCHERS:
+                        self._logger.debug("Floor Action has id %s. Will add.", act_id)
+                        if self._add_floor_action(floor_action):
+                            items += 1
+                    else:
+                        self._logger.debug("Floor Action has had %s. Skipping.", act_id)
+                    floor_action.clear()
+                    _drop_read(floor_action)
+                elif only_eod:
+                    # Nothing but the end of day is wanted, so nothing else needs to be kept.
+                    floor_action.clear()
+        except ET.ParseError as xmlerror:
+            self._logger.error("Could not parse XML. Received error '%s'. Skiping.", xmlerror)
+            return items
+        if only_eod:
+            self._logger.error("Journal has no end of legislative day record.")
+        else:
+            self._logger.info("Processed all floor actions.")
         return items
 
     def _add_end_day(self, end_day):
@@ -207,19 +326,22 @@ class House(Chamber):
         Add the end of day.
 
         :param end_day:
-        :return:
+        :return: True if added, false if it was already in the event log.
+        :rtype: bool
         """
 
-        convenes_dt = datetime.strptime(
-            end_day.get('next-legislative-day-convenes'), "%Y%m%dT%H:%M").replace(tzinfo=Chamber._dctz)
+        convenes_dt = _parse_compact(end_day.get('next-legislative-day-convenes'), _DCTZ)
         # Create a new future event.
         event = {
-            'type': chambers.const.CONVENE_SCHEDULED,
+            'type': CONVENE_SCHEDULED,
             'timestamp': convenes_dt
         }
         event['id'] = event['timestamp'].timestamp()
-        self._events.append(event)
-
+        if event['id'] in self._events_by_id:
+            self._logger.debug("End of day %s is already in the event log.", convenes_dt)
+            return False
+        self._add_event(event)
+        return True
 
     def _add_floor_action(self, floor_action):
         """
@@ -228,90 +350,41 @@ class House(Chamber):
         :return: True if added, false if not.
         :rtype: bool
         """
-        do_add = False
+        fa_dt = _parse_compact(floor_action.get('update-date-time'), _DCTZ)
         # Decide if this action *should* be added. Prevents duplicates.
-        if len(self._events) == 0:
-            do_add = True
-        else:
-            i = 0
-            del_list = []
-            while i < len(self._events):
-                if self._events[i]['id'] == floor_action.get('unique-id'):
-                    self._logger.debug("Floor action {} is already in event (item {})".format(floor_action.get('unique-id'),i))
-                    # Have to do a DT conversion here.
-                    fa_dt = datetime.strptime(floor_action.get('update-date-time'), "%Y%m%dT%H:%M").replace(tzinfo=Chamber._dctz)
-                    if fa_dt > self._events[i]['updated']:
-                        # If the new floor action matches an existing one and has a newer update, replace.
-                        self._logger.debug("Floor action newer than existing one. {} vs {}. Will replace.".
-                                          format(fa_dt, self._events[i]['updated']))
-                        del_list.append(i)
-                        do_add = True
-                        break
-                    else:
-                        self._logger.debug("Floor action not newer than existing. {} vs {}. Will not replace.".
-                                          format(fa_dt, self._events[i]['updated']))
-                        return False
-                else:
-                    do_add = True
-                i += 1
-
-
-        if do_add:
-            if floor_action.tag == 'floor_action':
-                event = {
-                    'id': floor_action.get('unique-id'), # The unique ID of this action.
-                    'act-id': floor_action.get('act-id'), # Preserving the act-id. May need this? TBD.
-                    'updated': datetime.strptime(floor_action.get('update-date-time'),
-                                                 "%Y%m%dT%H:%M").replace(tzinfo=Chamber._dctz),
-                    # The action time lives in a child element action_time element. The for-search has an ISO8601 time.
-                    'timestamp': datetime.strptime(floor_action.find('action_time').get('for-search'),
-                                               "%Y%m%dT%H:%M:%S").replace(tzinfo=Chamber._dctz),
-                    'description': floor_action.find('action_description').text.strip()
-                }
-
-                if floor_action.get('act-id') == 'H20100': # Convenings
-                    if 'The House convened, returning from a recess' in event['description']:
-                        self._logger.info("Event {} - Return from Recess.".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.RECONVENE
-                    elif 'The House convened, starting a new legislative day.' in event['description']:
-                        self._logger.info("Event {} - New Legislative Day.".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.CONVENE
-                # Adjournments and Recesses get lumped together as an H61000
-                elif floor_action.get('act-id') == 'H61000':
-                    self._logger.debug("Raw H61000 action: {}".format(floor_action))
-                    # Adjourn
-                    if ('The House adjourned' or 'The Speaker announced that the House do now adjourn'
-                            in event['description']):
-                        self._logger.info("Event {} - Adjournment.".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.ADJOURN
-                    elif ('The Speaker announced that the House do now recess. The next meeting is scheduled for'
-                          in event['description']):
-                        self._logger.info("Event {} - Recess to time.".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.RECESS_TIME
-                    elif 'The Speaker announced that the House do now recess. The next meeting is subject to the call of the Chair.' == event['description']:
-                        self._logger.info("Event {} - Recess to call of chair.".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.RECESS_COC
-                    elif 'The Speaker announced that the House do now recess for a period of less than 15 minutes.':
-                        self._logger.info("Event {} - Recess for less than 15m".format(floor_action.get("act-id")))
-                        event['type'] = chambers.const.RECESS_15M
-                elif event['act-id'] == 'H8D000':
-                    if 'MORNING-HOUR DEBATE' in event['description']:
-                        event['type'] = chambers.const.MORNING_DEBATE
-                    elif 'DEBATE - ' in event['description']:
-                        event['type'] = chambers.const.DEBATE_BILL
-                        event['action_item'] = floor_action.find('action_item').text
-                    else:
-                        event['type'] = chambers.const.OTHER
-                elif event['act-id'] == 'H37100':
-                    self._logger.info("Event {} - Recorded Vote".format(floor_action.get("act-id")))
-                    event['type'] = chambers.const.VOTE_RECORDED
-                    event['action_item'] = floor_action.find('action_item').text
-                elif event['act_id'] == 'H35000':
-                    self._logger.info("Event {} - Voice Vote".format(floor_action.get("act-id")))
-                    event['type'] = chambers.const.VOTE_VOICE
-                    event['action_item'] = floor_action.find('action_item').text
-                # Add to the event log.
-                self._events.append(event)
+        existing = self._events_by_id.get(floor_action.get('unique-id'))
+        if existing is not None:
+            self._logger.debug("Floor action %s is already in event log.", floor_action.get('unique-id'))
+            if fa_dt > existing['updated']:
+                # If the new floor action matches an existing one and has a newer update, replace.
+                self._logger.debug("Floor action newer than existing one. %s vs %s. Will replace.", fa_dt,
+                                   existing['updated'])
+                self._remove_event(existing)
+            else:
+                self._logger.debug("Floor action not newer than existing. %s vs %s. Will not replace.", fa_dt,
+                                   existing['updated'])
+                return False
+
+        if floor_action.tag == 'floor_action':
+            event = {
+                'id': floor_action.get('unique-id'), # The unique ID of this action.
+                'act-id': floor_action.get('act-id'), # Preserving the act-id. May need this? TBD.
+                'updated': fa_dt,
+                # The action time lives in a child element action_time element. The for-search has an ISO8601 time.
+                'timestamp': _parse_compact(floor_action.find('action_time').get('for-search'), _DCTZ),
+                'description': floor_action.find('action_description').text.strip()
+            }
+
+            act_id = event['act-id']
+            for marker, event_type, note in _DESCRIPTION_MATCHERS.get(act_id, ()):
+                if marker in event['description']:
+                    self._logger.info("Event %s - %s", act_id, note)
+                    event['type'] = event_type
+                    if event_type in _ACTION_ITEM_TYPES:
+                        event['action_item'] = floor_action.findtext('action_item')
+                    break
+            # Add to the event log.
+            self._add_event(event)
         return True
 
 
@@ -4,22 +4,76 @@ Senate current status and calendar
 
 from .chamber import Chamber
 import chambers.const
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timezone, timedelta
+import functools
+import io
+import itertools
 import json
 import logging
 import re
 import requests
-import urllib.request
-import xml.etree.ElementTree as ET
-import zoneinfo
+# lxml is optional. It parses a good deal faster, and the rest of the code only uses the API it shares with ElementTree.
+try:
+    from lxml import etree as ET
+    _ITERPARSE_OPTIONS = {'resolve_entities': False, 'no_network': True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _ITERPARSE_OPTIONS = {}
+
+# orjson is optional. It parses straight from bytes and is a good deal faster than the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .exceptions import ChamberExceptionRecoverable
 
+# Patterns for picking times and dates out of the Senate's floor activity text. Compiled once here.
+_TIME_PATTERN = "{}\\s*(\\d{{1,2}}:?\\d{{0,2}}) ([ap]\\s*\\.?m\\s*\\.?)"
+_TIME_RES = {prefix: re.compile(_TIME_PATTERN.format(prefix)) for prefix in ('at', 'to order at', 'until')}
+# Finds where the next convening starts, and picks up its time in the same pass when it directly follows 'until'.
+_UNTIL_RE = re.compile(_TIME_PATTERN.format("until") + "|until")
+_CONVENE_DATE_RE = re.compile("on\\s*\\w*,\\s*(\\w*)\\s*(\\d*),\\s*(\\d{4})")
+# Time used when the text says 'noon' rather than giving a clock time.
+_NOON = time(12, 0)
+# Fixed intervals, made once rather than on every parse.
+_ONE_DAY = timedelta(days=1)
+_TWELVE_HOURS = timedelta(hours=12)
+_FIVE_SEC = timedelta(seconds=5)
+# Month numbers by English name, so dates don't depend on the locale.
+_MONTH_NAMES = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12
+}
+
+
+def _json_loads(content):
+    """ Parse JSON bytes, with orjson if it's available. """
+    if orjson is not None:
+        return orjson.loads(content)
+    else:
+        return json.loads(content)
+
+
 class Senate(Chamber):
     """
     Senate current status and calendar
     """
     floor_schedule_url = "https://www.senate.gov/legislative/schedule/floor_schedule.json"
+    # Whether the JSON's convening has happened yet, and whether a recess is taken as an adjournment, both depend on
+    # the time the document is read. So an unchanged document still has to be parsed again.
+    _replay_unchanged = True
 
 
     def __init__(self, load_cache=True, tz = 'America/New_York', parent_logger=None, log_level=logging.WARNING):
@@ -45,134 +99,177 @@ class Senate(Chamber):
         :return: True if update performed, False if not.
         :rtype: bool
         """
+        # Cached results are only good for one update cycle.
+        self._cache_token += 1
+        if not (force or self.next_update is None or self._update_due()):
+            return False
+        now = datetime.now(timezone.utc)
         if force:
             # Always load if we're forced, or if we don't have any data yet.
             self._logger.info("Force load requested.")
             try:
                 self._load()
-            except urllib.error.URLError as urle:
-                self._logger.error("Cannot connect to Senate site ({}")
-                raise ChamberExceptionRecoverable from urle
+            except requests.exceptions.RequestException as rqe:
+                self._logger.error("Cannot connect to Senate site (%s)", rqe)
+                raise ChamberExceptionRecoverable from rqe
             return True
         elif self.next_update is None:
             self._logger.info("Next update is not set. Probably need to update now! Loading.")
             self._load()
-            self._set_next_update()
+            self._set_next_update(now)
             return True
-        elif datetime.now(timezone.utc) > self.next_update:
+        else:
             self._load(days=days)
-            self._set_next_update()
+            self._set_next_update(now)
             return True
-        else:
-            return False
 
-    def _load(self, xml=True, json=True, days=None):
+    def _load(self, load_xml=True, load_json=True, days=None):
         """
         Load data about the state of the Senate from XML and JSON sources.
 
-        :param xml: Should the Senate's XML sources be loaded?
-        :type xml: bool
-        :param json: Should the Senate's JSON source be loaded?
-        :type json: bool
+        :param load_xml: Should the Senate's XML sources be loaded?
+        :type load_xml: bool
+        :param load_json: Should the Senate's JSON source be loaded?
+        :type load_json: bool
         :param days: How many days of XML data should be loaded? If None, will continue until both a CONVENE and ADJOURN
         event have been found.
         :type days: int
         :return:
         """
 
-        # Load the JSON.
-        if json:
-            event_count = self._load_json()
-            if event_count == 1:
-                noun = 'event'
-            else:
-                noun = 'events'
-            self._logger.info(f"Loaded {event_count} {noun} from JSON.")
-
-        # Try the XML. XML usually isn't published until the day after, so this is only useful for the previous day's
-        # adjournment. Still, try today, maybe that will change.
-        # This will start with today's date and try each successive previous day until two days worth of data are loaded.
-        if xml:
-            i = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The schedule JSON doesn't depend on the XML, so it's fetched in the background while the XML walk-back
+            # gets going. It's still loaded first, since what it adds can end the walk-back early.
+            if load_json:
+                json_fetch = executor.submit(self._get, Senate.floor_schedule_url)
+
+            # Try the XML. XML usually isn't published until the day after, so this is only useful for the previous
+            # day's adjournment. Still, try today, maybe that will change.
+            # This will start with today's date and try each successive previous day until two days worth of data are
+            # loaded.
+            if load_xml:
+                today = datetime.now()
+
+                def fa_url(days_back):
+                    search_date = today - timedelta(days=days_back)
+                    return self._floor_activity_url(search_date.month, search_date.day, search_date.year)
+
+                # Publication can lag across weekends and recesses, so a day is only taken as final once it's a week
+                # old. When a day's XML doesn't exist, the Senate redirects to a 404 page. Redirects aren't followed, so
+                # that page is never downloaded, and the redirect itself says the day is missing.
+                # When a number of days is asked for, at least that many have to be fetched, so fetch them together.
+                xml_days = self._fetch_days(fa_url, final_from=7, allow_redirects=False,
+                                            first_window=2 if days is None else days)
+                try:
+                    # Starting the walk-back sends off its first requests, alongside the JSON.
+                    first_day = next(xml_days, None)
+                except requests.exceptions.RequestException as rqe:
+                    xml_days.close()
+                    if load_json:
+                        # Don't wait on the JSON if it hasn't started. If it has, leaving the executor collects it.
+                        json_fetch.cancel()
+                    raise ChamberExceptionRecoverable from rqe
+
+            # Load the JSON.
+            if load_json:
+                try:
+                    event_count = self._load_json(json_fetch)
+                except ChamberExceptionRecoverable:
+                    if load_xml:
+                        xml_days.close()
+                    raise
+                self._logger.info("Loaded %d %s from JSON.", event_count, 'event' if event_count == 1 else 'events')
+
+        if load_xml:
             days_loaded = 0
-            done_loading = False
-            while done_loading is False:
-                search_date = (datetime.now() - timedelta(days=i))
-                fa_url = self._floor_activity_url(search_date.month, search_date.day, search_date.year)
-                self._logger.info(f"Trying to load from Floor Activity URL {fa_url}")
-                senate_xml_response = requests.get(fa_url)
-                # When a day's XML doesn't exist, the Senate returns a 404 page via 302 redirect. This reads as 'okay' but
-                # isn't parseable (obviously). Try to filter this via by checking for two known good states.
-                loadable = False
-                if len(senate_xml_response.history) == 0 and senate_xml_response.ok:
-                    self._logger.debug("Only one response and is okay. Will load XML.")
-                    # OK status and *no* history. This is okay to load.
-                    loadable = True
-                elif senate_xml_response.history[0].status_code == 200:
-                    self._logger.debug("Load history exists. First load is 200. Will load XML.")
-                    # There *is* a history, and the first status code is a 200. This is loadable.
-                    loadable = True
-                else:
-                    self._logger.debug("No good response history, will not load, probably not XML.")
-                if loadable:
-                    self._logger.info("Found floor proceedings for {}. Loading.".format(
-                        (datetime.now() - timedelta(days=i)).strftime('%d %b %Y')
-                    ))
-                    event_count = self._load_xml(senate_xml_response.content, fa_url)
-                    if event_count == 1:
-                        noun = 'event'
+            try:
+                for i, senate_xml_response in itertools.chain((first_day,) if first_day is not None else (), xml_days):
+                    self._logger.info("Fetched Floor Activity URL %s", senate_xml_response.url)
+                    loadable = False
+                    if self._is_missing(senate_xml_response):
+                        self._logger.debug("Redirected or not found, no XML for this day.")
+                    elif senate_xml_response.status_code == 200:
+                        self._logger.debug("Response is okay. Will load XML.")
+                        loadable = True
+                    else:
+                        self._logger.debug("Got status %s, will not load.", senate_xml_response.status_code)
+                    if loadable:
+                        # The date is only for logging, so it's left to the logger to format, if the message is used.
+                        search_date = (today - timedelta(days=i)).date()
+                        self._logger.info("Found floor proceedings for %s. Loading.", search_date)
+                        event_count = self._load_xml(senate_xml_response.content, senate_xml_response.url)
+                        self._logger.info("Loaded %d %s from journal on %s", event_count,
+                                          'event' if event_count == 1 else 'events', search_date)
+
+                        days_loaded += 1
+
+                    # Check for end condition, based on the input options.
+                    if days is None:
+                        if self._latest_convene() is not None and self._latest_adjourn() is not None:
+                            break
                     else:
-                        noun = 'events'
-                    self._logger.info(f"Loaded {event_count} {noun} from journal on "
-                                      f"{(datetime.now() - timedelta(days=i)).strftime('%d %b %Y')}")
-
-                    days_loaded += 1
-                i += 1
-
-                # Check for end condition, based on the input options.
-                if days is None:
-                    if (self._search_events(types=chambers.const.CONVENE) is not None and
-                       self._search_events(types=chambers.const.ADJOURN) is not None):
-                        done_loading = True
-                else:
-                    if days_loaded >= days:
-                        done_loading = True
-            self._logger.info(f"Loaded {days_loaded} days of Senate XML data.")
-
-
-        self._logger.info("Sorting events.")
-        self._sort_events()
+                        if days_loaded >= days:
+                            break
+            except requests.exceptions.RequestException as rqe:
+                raise ChamberExceptionRecoverable from rqe
+            finally:
+                # Done with the walk-back, so don't start any more of it.
+                xml_days.close()
+            self._logger.info("Loaded %d days of Senate XML data.", days_loaded)
+
         # self._trim_event_log()
         self._updated = datetime.now(tz=self._dctz)
         self._logger.info("Load complete.")
-        self._next_update = self._set_next_update()
+        self._set_next_update()
         return True
 
-    def _load_json(self):
+    def _is_missing(self, response):
+        """
+        Does this response say the day has no data? For a day with no XML, the Senate redirects to a 404 page, which
+        itself comes back as a 200. Day fetches don't follow redirects, so the redirect is what's seen here.
+
+        :param response: The response for a day.
+        :type response: requests.Response
+        :return: bool
+        """
+        return response.status_code in (301, 302, 303, 307, 308, 404)
+
+    def _load_json(self, json_fetch=None):
         """
         Load the Senate's Floor Activity JSON as an event.
-        :return:
+
+        :param json_fetch: A fetch of the JSON that's already under way, if any. If None, it's fetched here.
+        :type json_fetch: concurrent.futures.Future
+        :return: Number of events added.
+        :rtype: int
         """
 
         try:
-            with urllib.request.urlopen(Senate.floor_schedule_url) as url:
-                senate_data = json.load(url)
-        except urllib.error.URLError as urle:
-            raise ChamberExceptionRecoverable from urle
-
+            if json_fetch is None:
+                json_response = self._get(Senate.floor_schedule_url)
+            else:
+                json_response = json_fetch.result()
+            json_response.raise_for_status()
+        except requests.exceptions.RequestException as rqe:
+            raise ChamberExceptionRecoverable from rqe
+        # An unchanged schedule comes back with the body it had before, since whether it's convened yet depends on now.
+        senate_data = _json_loads(json_response.content)
+
+        proceedings = senate_data['floorProceedings'][0]
         convene_dt = datetime(
-                int(senate_data['floorProceedings'][0]['conveneYear']),
-                int(senate_data['floorProceedings'][0]['conveneMonth']),
-                int(senate_data['floorProceedings'][0]['conveneDay']),
-                int(senate_data['floorProceedings'][0]['conveneHour']),
-                int(senate_data['floorProceedings'][0]['conveneMinutes']),
-                tzinfo=zoneinfo.ZoneInfo('America/New_York')
+                int(proceedings['conveneYear']),
+                int(proceedings['conveneMonth']),
+                int(proceedings['conveneDay']),
+                int(proceedings['conveneHour']),
+                int(proceedings['conveneMinutes']),
+                tzinfo=self._dctz
         )
 
-        if convene_dt < datetime.now(self._dctz):
+        now = datetime.now(self._dctz)
+        if convene_dt < now:
             convened = True
             event_type = chambers.const.CONVENE
-        elif convene_dt > datetime.now(self._dctz):
+        elif convene_dt > now:
             convened = False
             event_type = chambers.const.CONVENE_SCHEDULED
         else:
@@ -186,10 +283,12 @@ class Senate(Chamber):
             'source_url': Senate.floor_schedule_url
         }
 
-        # Add the event if the JSON state isn't consistent with the current state in the object.
-        if convened != self._convened:
-            self._add_floor_action(json_event)
-            return 1
+        # Add the event if the JSON state isn't consistent with the current state in the object, or the convening it
+        # gives isn't in the event log yet.
+        if convened != self._convened or self._event_at(convene_dt) is None:
+            added = self._add_floor_action(json_event)
+            self._convened = convened
+            return 1 if added else 0
         return 0
 
 
@@ -197,26 +296,58 @@ class Senate(Chamber):
         """
         Load a Senate Floor Proceedings XML.
 
-        :return:
+        :param floor_proceedings: The raw XML document, as fetched. Passed to the parser as bytes, undecoded, so the
+            parser goes by the encoding the document declares.
+        :type floor_proceedings: bytes
+        :param source_url: The URL this data came from, to be baked into the events.
+        :type source_url: str
+        :return: Number of events added.
+        :rtype: int
         """
         # List of new events to add to the main event log.
         new_events = []
 
-        # Create an XML tree.
+        # Stream through the file rather than building the whole tree. Only a few of the top level elements are needed,
+        # so their text is taken as each one finishes, and then it's cleared. For the sections, only the first recess
+        # and the first adjournment that have content are wanted.
+        found = {}
+        departures = {}
+        depth = 0
         try:
-            senate_tree = ET.fromstring(floor_proceedings)
+            for event, element in ET.iterparse(io.BytesIO(floor_proceedings), events=('start', 'end'),
+                                               **_ITERPARSE_OPTIONS):
+                if event == 'start':
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    # Only the root's children matter. Anything deeper is read through its parent.
+                    continue
+                if element.tag in ('date_iso_8601', 'intro_text'):
+                    found.setdefault(element.tag, element.text)
+                elif element.tag == 'section':
+                    section_type = element.get('type')
+                    if section_type in ('recess', 'adjournment') and section_type not in departures:
+                        content = element.find('content')
+                        if content is not None:
+                            departures[section_type] = content.text
+                element.clear()
         except ET.ParseError as xmlerror:
-            self._logger.error(f"Could not parse XML from source {source_url}. Received error '{xmlerror}'. Skiping.")
+            self._logger.error("Could not parse XML from source %s. Received error '%s'. Skiping.", source_url, xmlerror)
             return 0
         # Pull out the base date. This has to get combined with the time later.
-        base_date = datetime.strptime(senate_tree.find('date_iso_8601').text, '%Y-%m-%d').replace(tzinfo=self._dctz)
-        self._logger.debug(f"Extracted base date {base_date}")
+        try:
+            base_date = datetime.fromisoformat(found['date_iso_8601']).replace(tzinfo=self._dctz)
+        except KeyError:
+            self._logger.error("File from source %s has no 'date_iso_8601'. Skipping.", source_url)
+            return 0
+        self._logger.debug("Extracted base date %s", base_date)
 
         # Parse the Intro Text for a convening *time*
-        # Search and pull out the text. This has information about convening.
+        # This has information about convening.
         try:
-            intro_text = senate_tree.find("intro_text").text
-        except AttributeError:
+            intro_text = found['intro_text']
+        except KeyError:
             self._logger.debug("File has no 'intro_text', nothing usable here.")
             return 0
         else:
@@ -224,19 +355,18 @@ class Senate(Chamber):
             if convene_event is not None:
                 new_events.append(convene_event)
 
-
         # Check for a 'recess' or 'adjournment' at the end of the activity.
-        recess = senate_tree.find("section[@type='recess']/content")
+        recess = departures.get('recess')
         if recess is not None:
-            recess_events = self._parse_recess(recess.text, base_date, source_url)
+            recess_events = self._parse_recess(recess, base_date, source_url)
             new_events.extend(recess_events)
             # depart_type = chambers.const.RECESS_TIME
             # depart_string = recess
 
         # Check for adjournment. This shouldn't happen at the same time as a recess.
-        adjournment = senate_tree.find("section[@type='adjournment']/content")
-        if isinstance(adjournment, ET.Element):
-            adjournment_events = self._parse_adjournment(adjournment.text, base_date, source_url)
+        adjournment = departures.get('adjournment')
+        if adjournment is not None:
+            adjournment_events = self._parse_adjournment(adjournment, base_date, source_url)
             new_events.extend(adjournment_events)
 
         added_events = 0
@@ -253,38 +383,34 @@ class Senate(Chamber):
         :return: True if added, false if not.
         :rtype: bool
         """
-        # Assume we'll add.
-        do_add = True
-        del_list = []
-        i = 0
-        while i < len(self._events):
-            if self._events[i]['timestamp'] == floor_action['timestamp']:
-                if self._events[i]['type'] == chambers.const.CONVENE and floor_action['type'] == chambers.const.CONVENE_SCHEDULED:
-                    self._logger.debug("Floor action already exists at timestamp {}. Existing action is an actual "
-                                       "convene, new action is a scheduled convene. Will not replace.".
-                                       format(floor_action['timestamp']))
-                    # Since we don't want to have two convenes, block it here.
-                    do_add = False
-                elif self._events[i]['type'] == chambers.const.CONVENE and floor_action['type'] == chambers.const.ADJOURN:
-                    self._logger.debug("Senate convened and adjourned at exactly the same time, likely for a pro-forma "
-                                       "session. Adjusting the adjournment back 5s.")
-                    floor_action['timestamp'] = floor_action['timestamp'] + timedelta(seconds=5)
-                else:
-                    self._logger.debug("Floor action already exists at timestamp {}. Will replace.".
-                                       format(floor_action['timestamp']))
-                    del_list.append(i)
-                break
-            i += 1
-
-        if do_add:
-            self._events.append(floor_action)
-
-        # Reverse the list.
-        self._logger.debug("Items to delete: {}".format(del_list))
-        del_list.reverse()
-        for item in del_list:
-            self._logger.debug("Removing item at position {}, timestamp {}".format(item, self._events[item]['timestamp']))
-            self._events.pop(item)
+        existing = self._event_at(floor_action['timestamp'])
+        if (existing is not None and existing['type'] == chambers.const.CONVENE
+                and floor_action['type'] == chambers.const.ADJOURN):
+            self._logger.debug("Senate convened and adjourned at exactly the same time, likely for a pro-forma "
+                               "session. Adjusting the adjournment back 5s.")
+            floor_action['timestamp'] = floor_action['timestamp'] + _FIVE_SEC
+            existing = self._event_at(floor_action['timestamp'])
+        if existing is not None:
+            if existing == floor_action:
+                # The same sources get loaded again on every update. An identical event changes nothing, so leave the
+                # event log, and its revision, alone.
+                self._logger.debug("Floor action at timestamp %s is already in the event log.",
+                                   floor_action['timestamp'])
+                return False
+            elif (existing['type'] == chambers.const.CONVENE
+                  and floor_action['type'] == chambers.const.CONVENE_SCHEDULED):
+                self._logger.debug("Floor action already exists at timestamp %s. Existing action is an actual "
+                                   "convene, new action is a scheduled convene. Will not replace.",
+                                   floor_action['timestamp'])
+                # Since we don't want to have two convenes, block it here.
+                return False
+            else:
+                self._logger.debug("Floor action already exists at timestamp %s. Will replace.",
+                                   floor_action['timestamp'])
+                # Swap the old event out directly. Its type may differ, so it has to come out of the indexes too.
+                self._remove_event(existing)
+
+        self._add_event(floor_action)
         return True
 
     def _parse_adjournment(self, adjournment_text, base_date, source_url):
@@ -301,7 +427,7 @@ class Senate(Chamber):
         """
         new_events = []
         adjournment_text = adjournment_text.replace("\n", "")
-        self._logger.debug(f"Adjournment text is '{adjournment_text}'")
+        self._logger.debug("Adjournment text is '%s'", adjournment_text)
         adjournment_time = self._time_from_senate_string(adjournment_text, 'at')
 
         # if "Under the authority of the order of" in adjournment_text:
@@ -314,7 +440,7 @@ class Senate(Chamber):
         #     )
         #     adjourn_at = datetime.combine(adjourn_date, adjournment_time).replace(tzinfo=self._dctz)
         # else:
-        adjourn_at = datetime.combine(base_date, adjournment_time).replace(tzinfo=self._dctz)
+        adjourn_at = datetime.combine(base_date, adjournment_time, tzinfo=self._dctz)
 
         adjournment_event = {
             'timestamp': adjourn_at,
@@ -344,10 +470,10 @@ class Senate(Chamber):
         :rtype: dict
         """
         intro_text = intro_text.replace('\n','')
-        self._logger.debug(f"Parsing intro text '{intro_text}'")
+        self._logger.debug("Parsing intro text '%s'", intro_text)
         convene_time = self._time_from_senate_string(intro_text, "to order at")
         if convene_time is not None:
-            convene_dt = datetime.combine(base_date.date(), convene_time).replace(tzinfo=self._dctz)
+            convene_dt = datetime.combine(base_date.date(), convene_time, tzinfo=self._dctz)
             # Make a convene event
             convene_event = {
                 'timestamp': convene_dt,
@@ -373,9 +499,9 @@ class Senate(Chamber):
         """
         new_events = []
         recess_text = recess_text.replace("\n", "")
-        self._logger.info(f"Recess text is '{recess_text}'")
+        self._logger.info("Recess text is '%s'", recess_text)
         recess_time = self._time_from_senate_string(recess_text, 'at')
-        depart_at = datetime.combine(base_date, recess_time).replace(tzinfo=self._dctz)
+        depart_at = datetime.combine(base_date, recess_time, tzinfo=self._dctz)
 
         convene_event = self._parse_next_convening(recess_text, base_date, source_url)
 
@@ -383,12 +509,12 @@ class Senate(Chamber):
         #TODO: Rework 'Adjourned' to be 'NOT_CONVENED'
         if convene_event is not None:
             new_events.append(convene_event)
-            if convene_event['timestamp'] - datetime.now(timezone.utc) > timedelta(hours=12):
-                r_type = chambers.const.RECESS
+            if convene_event['timestamp'] - datetime.now(timezone.utc) > _TWELVE_HOURS:
+                r_type = chambers.const.RECESS_TIME
             else:
                 r_type = chambers.const.ADJOURN
         else:
-            r_type = chambers.const.RECESS
+            r_type = chambers.const.RECESS_TIME
 
         recess_event = {
             'timestamp': depart_at,
@@ -417,14 +543,22 @@ class Senate(Chamber):
         """
 
         # Find the next convening.
-        until_pos = re.search("until", depart_text)
-        convening_text = depart_text[until_pos.span()[0]:]
-        self._logger.debug(f"Convene text is: {convening_text}")
-        convene_time = self._time_from_senate_string(convening_text, 'until')
-        self._logger.debug(f"Senate convene time is '{convene_time}'")
+        until_pos = _UNTIL_RE.search(depart_text)
+        if until_pos is None:
+            self._logger.debug("No 'until' in text '%s', so no next convening.", depart_text)
+            return None
+        convening_text = depart_text[until_pos.start():]
+        self._logger.debug("Convene text is: %s", convening_text)
+        if until_pos.group(1) is not None:
+            convene_time = self._time_from_match(until_pos)
+        else:
+            convene_time = self._time_from_senate_string(convening_text, 'until')
+        self._logger.debug("Senate convene time is '%s'", convene_time)
+        if convene_time is None:
+            return None
         # Does this reference tomorrow?
         if "tomorrow" in convening_text:
-            convenes_at = datetime.combine((base_date + timedelta(days=1)).date(), convene_time).replace(tzinfo=self._dctz)
+            convenes_at = datetime.combine(base_date + _ONE_DAY, convene_time, tzinfo=self._dctz)
             convenes_event = {
                 'timestamp': convenes_at,
                 'type': chambers.const.CONVENE_SCHEDULED,
@@ -434,14 +568,14 @@ class Senate(Chamber):
             }
             return convenes_event
         else:
-            convene_date_search = re.search("on\\s*\\w*,\\s*(\\w*)\\s*(\\d*),\\s*(\\d{4})", convening_text)
-            if len(convene_date_search.groups()) == 3:
+            convene_date_search = _CONVENE_DATE_RE.search(convening_text)
+            if convene_date_search is not None:
                 convene_date = self._date_from_senate_string(
                     convene_date_search.group(1),
                     convene_date_search.group(2),
                     convene_date_search.group(3)
                 )
-                convenes_at = datetime.combine(convene_date, convene_time).replace(tzinfo=self._dctz)
+                convenes_at = datetime.combine(convene_date, convene_time, tzinfo=self._dctz)
                 convenes_event = {
                     'timestamp': convenes_at,
                     'type': chambers.const.CONVENE_SCHEDULED,
@@ -465,29 +599,14 @@ class Senate(Chamber):
         :rtype: datetime.date
         """
 
-        month_names = {
-            "january": 1,
-            "february": 2,
-            "march": 3,
-            "april": 4,
-            "may": 5,
-            "june": 6,
-            "july": 7,
-            "august": 8,
-            "september": 9,
-            "october": 10,
-            "november": 11,
-            "december": 12
-        }
-
         # Find the month number. We do this to be locale neutral.
         try:
-            month_num = month_names[month_name.lower()]
+            month_num = _MONTH_NAMES[month_name.lower()]
         except KeyError as ke:
-            self._logger.error(f"Month name '{month_name}' not found.")
+            self._logger.error("Month name '%s' not found.", month_name)
             raise ke
         else:
-            return datetime(month=int(month_num), day=int(day), year=int(year)).date()
+            return date(int(year), month_num, int(day))
 
     def _time_from_senate_string(self, input_string, prefix):
         """ Extract time from the Senate's string
@@ -501,33 +620,51 @@ class Senate(Chamber):
         :rtype: datetime.time
         """
 
-        self._logger.debug(f"Trying to extract time from string '{input_string}'")
-        search = f"{prefix}\\s*(\\d{{1,2}}:?\\d{{0,2}}) ([a|p]\\s*\\.?m\\s*\\.?)"
-        time_search = re.search(search, input_string)
+        self._logger.debug("Trying to extract time from string '%s'", input_string)
+        try:
+            time_re = _TIME_RES[prefix]
+        except KeyError:
+            time_re = _TIME_RES[prefix] = re.compile(_TIME_PATTERN.format(prefix))
+        time_search = time_re.search(input_string)
 
         if time_search is None:
             if 'noon' in input_string:
-                ct_string = "12:00 pm"
+                return _NOON
             else:
-                self._logger.warning(f"No usable time found in text '{input_string}'")
+                self._logger.warning("No usable time found in text '%s'", input_string)
                 return None
         elif len(time_search.groups()) > 2:
-            self._logger.warning(f"Too many times in text '{input_string}'")
+            self._logger.warning("Too many times in text '%s'", input_string)
             return None
         elif len(time_search.groups()) < 2:
-            self._logger.warning(f"No usable time found in text '{input_string}'")
+            self._logger.warning("No usable time found in text '%s'", input_string)
             return None
         else:
-            ampm = time_search.group(2).replace('.', '').replace(' ','')
-            if ":" in time_search.group(1):
-                ct_string = time_search.group(1) + " " + ampm
-            else:
-                ct_string = time_search.group(1) + ":00 " + ampm
+            return self._time_from_match(time_search)
 
-        return datetime.strptime(f"{ct_string}", "%I:%M %p").time()
+    @staticmethod
+    def _time_from_match(time_search):
+        """ Make a time from a match of the Senate time pattern.
+
+        :param time_search: Match with the clock time as group 1 and am/pm as group 2.
+        :type time_search: re.Match
+        :returns: Time object. This is a literal, non-timezone aware time.
+        :rtype: datetime.time
+        """
+        # The pattern has already checked the shape, so this just needs the numbers. Much quicker than strptime.
+        hour, _, minute = time_search.group(1).partition(':')
+        hour = int(hour)
+        if not 1 <= hour <= 12:
+            raise ValueError(f"Hour '{hour}' is not a 12-hour clock hour.")
+        # 12 am is midnight and 12 pm is noon, so twelve wraps around to zero before the afternoon is added.
+        hour = hour % 12
+        if time_search.group(2)[0] == 'p':
+            hour += 12
+        return time(hour, int(minute) if minute else 0)
 
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def _floor_activity_url(month, day, year):
         """ Build a floor activity URL for a particular date.
 
@@ -0,0 +1,56 @@
+"""
+Tests for behaviour shared by all chambers.
+"""
+import logging
+import os
+import pathlib
+import tempfile
+import time
+import unittest
+
+import chambers
+
+
+class TestKeptJournals(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.house = chambers.House(load_cache=False, log_level=logging.ERROR)
+        self.house.cache_path = str(pathlib.Path(self._tmp.name) / 'house.cache')
+
+    def test_save_cache_prunes_old_journals(self):
+        journals = self.house._journal_path
+        journals.mkdir()
+        old = journals / '20200101.xml.cache'
+        recent = journals / '20200102.xml.cache'
+        old.write_bytes(b'<old/>')
+        recent.write_bytes(b'<recent/>')
+        written = time.time() - (chambers.House._max_days_back + 1) * 86400
+        os.utime(old, (written, written))
+
+        self.house.save_cache()
+
+        self.assertFalse(old.exists())
+        self.assertTrue(recent.exists())
+
+    def test_save_cache_without_journals(self):
+        # Nothing kept yet shouldn't stop the cache being saved.
+        self.house.save_cache()
+        self.assertTrue(pathlib.Path(self.house.cache_path).exists())
+
+
+class TestValidators(unittest.TestCase):
+    def test_save_cache_prunes_old_validators(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            house = chambers.House(load_cache=False, log_level=logging.ERROR)
+            house.cache_path = str(pathlib.Path(tmp) / 'house.cache')
+            stored = time.time() - (chambers.House._max_days_back + 1) * 86400
+            house._validators = {'old': ('"1"', None, None, stored), 'recent': ('"2"', None, None, time.time())}
+
+            house.save_cache()
+
+            self.assertEqual(list(house._validators), ['recent'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the House chamber, driven by canned responses rather than the network.
+"""
+import logging
+import pathlib
+import tempfile
+import unittest
+from datetime import datetime
+
+import requests
+
+import chambers
+
+
+class _Response:
+    """ Just enough of a requests.Response for the House's loaders. """
+    def __init__(self, status_code, content=b'', url=''):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = {}
+        self.history = []
+        self.url = url
+
+
+class _DownSession:
+    """ A network that's down. Every request fails to connect, except any URLs given, which get a 404. """
+    def __init__(self, reachable=()):
+        self.reachable = reachable
+
+    def get(self, url, **kwargs):
+        if url in self.reachable:
+            return _Response(404, url=url)
+        raise requests.exceptions.ConnectionError("Network is unreachable")
+
+
+class TestHouseConnectionErrors(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.house = chambers.House(load_cache=False, log_level=logging.CRITICAL)
+        self.house.cache_path = str(pathlib.Path(self._tmp.name) / 'house.cache')
+
+    def test_network_down(self):
+        self.house._session = _DownSession()
+        self.assertFalse(self.house._load())
+
+    def test_walk_back_fails(self):
+        # Today's journal can be fetched, but the previous days' can't.
+        self.house._session = _DownSession(reachable=(datetime.now().strftime(chambers.House._URL_FORMAT),))
+        self.assertFalse(self.house._load())
+
+
+_JOURNAL = (b"<?xml version='1.0' encoding='UTF-8'?><legislative_activity><floor_actions>"
+            b"<floor_action act-id='H61000' unique-id='1' update-date-time='20250106T15:00'>"
+            b"<action_time for-search='20250106T15:00:00'/><action_description>The House adjourned."
+            b"</action_description></floor_action>"
+            b"<legislative_day_finished next-legislative-day-convenes='20250107T10:00'/>"
+            b"</floor_actions></legislative_activity>")
+
+
+class TestHouseEndOfDay(unittest.TestCase):
+    def setUp(self):
+        self.house = chambers.House(load_cache=False, log_level=logging.CRITICAL)
+
+    def test_identical_reload_adds_nothing(self):
+        self.assertEqual(self.house._load_xml(_JOURNAL), 2)
+        self.assertEqual(self.house._load_xml(_JOURNAL), 0)
+
+    def test_only_eod(self):
+        self.assertEqual(self.house._load_xml(_JOURNAL, only_eod=True), 1)
+        self.assertEqual(self.house._load_xml(_JOURNAL, only_eod=True), 0)
+        # Only the end of day record is taken.
+        self.assertEqual([event['type'] for event in self.house._events], [chambers.const.CONVENE_SCHEDULED])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for the Senate chamber, driven by canned responses rather than the network.
+"""
+import json
+import logging
+import pathlib
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import requests
+
+import chambers
+from chambers.exceptions import ChamberExceptionRecoverable
+
+
+class _Response:
+    """ Just enough of a requests.Response for the Senate's loaders. """
+    def __init__(self, status_code, content=b'', url=''):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = {}
+        self.history = []
+        self.url = url
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+class _Session:
+    """
+    Serves fixed pages. Like senate.gov, any other day redirects to a 404 page. With etags set, pages carry an ETag and
+    a matching If-None-Match gets a 304. Otherwise no validators are sent.
+    """
+    def __init__(self, pages, etags=False):
+        self.pages = pages
+        self.etags = etags
+
+    def get(self, url, allow_redirects=True, headers=None, **kwargs):
+        if url not in self.pages:
+            return _Response(302, url=url)
+        if not self.etags:
+            return _Response(200, self.pages[url], url)
+        etag = '"{}"'.format(hash(self.pages[url]))
+        if (headers or {}).get('If-None-Match') == etag:
+            return _Response(304, url=url)
+        response = _Response(200, self.pages[url], url)
+        response.headers['ETag'] = etag
+        return response
+
+
+def _schedule(convene_dt):
+    """ The Senate's floor schedule JSON for a given convening. """
+    return json.dumps({'floorProceedings': [{'conveneYear': convene_dt.year, 'conveneMonth': convene_dt.month,
+                                             'conveneDay': convene_dt.day, 'conveneHour': convene_dt.hour,
+                                             'conveneMinutes': convene_dt.minute}]}).encode()
+
+
+class TestSenateIdleBackoff(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.senate = chambers.Senate(load_cache=False, log_level=logging.ERROR)
+        self.senate.cache_path = str(pathlib.Path(self._tmp.name) / 'senate.cache')
+
+        # The Senate's next convening is well out, and its last sitting was a week ago.
+        schedule = {'floorProceedings': [{'conveneYear': datetime.now().year + 1, 'conveneMonth': 1, 'conveneDay': 2,
+                                          'conveneHour': 10, 'conveneMinutes': 0}]}
+        sitting = datetime.now() - timedelta(days=8)
+        journal = (f"<?xml version='1.0' encoding='UTF-8'?><floor_activity>"
+                   f"<date_iso_8601>{sitting.strftime('%Y-%m-%d')}</date_iso_8601>"
+                   f"<intro_text>The Senate met and was called to order at 10 a.m., by the President pro tempore."
+                   f"</intro_text><section type='adjournment'><content>ADJOURNMENT\nThe Senate, at 10:05 a.m., "
+                   f"adjourned until 10 a.m., on Friday, January 2.</content></section></floor_activity>")
+        self.senate._session = _Session({
+            chambers.Senate.floor_schedule_url: json.dumps(schedule).encode(),
+            chambers.Senate._floor_activity_url(sitting.month, sitting.day, sitting.year): journal.encode()
+        })
+
+    def test_identical_loads_back_off(self):
+        self.senate._load()
+        revision = self.senate._log_revision
+        intervals = [self.senate._idle_interval]
+        for _ in range(3):
+            self.senate._load()
+            intervals.append(self.senate._idle_interval)
+
+        # Reloading the same data leaves the event log alone, so each load stretches the idle interval.
+        self.assertEqual(self.senate._log_revision, revision)
+        self.assertEqual(intervals[0], chambers.Senate._idle_interval_min)
+        for shorter, longer in zip(intervals, intervals[1:]):
+            self.assertGreater(longer, shorter)
+
+
+class TestSenateUnchangedSchedule(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.senate = chambers.Senate(load_cache=False, log_level=logging.ERROR)
+        self.senate.cache_path = str(pathlib.Path(self._tmp.name) / 'senate.cache')
+        self.convene_dt = (datetime.now(chambers.Senate._dctz) + timedelta(hours=1)).replace(second=0, microsecond=0)
+        self.session = _Session({chambers.Senate.floor_schedule_url: _schedule(self.convene_dt)}, etags=True)
+        self.senate._session = self.session
+
+    def _event_types(self):
+        return [event['type'] for event in self.senate._events if event['timestamp'] == self.convene_dt]
+
+    def test_unchanged_schedule_convenes_once_time_passes(self):
+        self.senate._load(load_xml=False)
+        self.assertEqual(self._event_types(), [chambers.const.CONVENE_SCHEDULED])
+
+        # Two hours on, the server says the schedule is unchanged. The convening has still happened.
+        later = datetime.now(chambers.Senate._dctz) + timedelta(hours=2)
+        with mock.patch('chambers.senate.datetime', wraps=datetime) as clock:
+            clock.now.side_effect = lambda tz=None: later.astimezone(tz)
+            self.senate._load(load_xml=False)
+        self.assertEqual(self._event_types(), [chambers.const.CONVENE])
+
+
+class _DownSession(_Session):
+    """ A network that's down. Every request fails to connect, except the pages given. """
+    def get(self, url, allow_redirects=True, headers=None, **kwargs):
+        if url in self.pages:
+            return super().get(url, allow_redirects, headers, **kwargs)
+        raise requests.exceptions.ConnectionError("Network is unreachable")
+
+
+class TestSenateConnectionErrors(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.senate = chambers.Senate(load_cache=False, log_level=logging.CRITICAL)
+        self.senate.cache_path = str(pathlib.Path(self._tmp.name) / 'senate.cache')
+
+    def test_network_down(self):
+        self.senate._session = _DownSession({})
+        with self.assertRaises(ChamberExceptionRecoverable):
+            self.senate._load()
+
+    def test_walk_back_fails(self):
+        # The schedule can be fetched, but none of the journals can.
+        convene_dt = datetime.now(chambers.Senate._dctz) + timedelta(days=1)
+        self.senate._session = _DownSession({chambers.Senate.floor_schedule_url: _schedule(convene_dt)})
+        with self.assertRaises(ChamberExceptionRecoverable):
+            self.senate._load()
+
+
+if __name__ == '__main__':
+    unittest.main()